@@ -23,9 +23,17 @@ class ClashRoyaleAnalyzer:
         }
         self.init_database()
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open a write connection tuned for short batch inserts"""
+        conn = sqlite3.connect(self.db_path)
+        # Each save is one transaction; NORMAL skips the extra fsync FULL does per commit
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+    
     def init_database(self):
         """Initialize SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Players table
@@ -41,6 +49,8 @@ class ClashRoyaleAnalyzer:
                 last_updated TEXT
             )
         """)
+        # Latest player lookup (ORDER BY last_updated DESC LIMIT 1) without a sort
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_last_updated ON players(last_updated DESC)")
         
         # Battles table
         cursor.execute("""
@@ -92,7 +102,10 @@ class ClashRoyaleAnalyzer:
             except sqlite3.OperationalError:
                 # Column already exists
                 pass
-        
+
+        # Index for "most recent battles" reads (ORDER BY battle_time DESC LIMIT n)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_battles_time ON battles(battle_time DESC)")
+
         # Clan members table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS clan_members (
@@ -153,6 +166,11 @@ class ClashRoyaleAnalyzer:
             )
         """)
         
+        # Latest deck per member (MAX(id) grouped/correlated by player_tag)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_cmd_player_id ON clan_member_decks(player_tag, id)")
+        # Member deck histories, read in (player_tag, first_seen) order
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_cmd_tag_seen ON clan_member_decks(player_tag, first_seen)")
+        
         # Deck performance view
         cursor.execute("""
             CREATE VIEW IF NOT EXISTS deck_performance AS
@@ -215,7 +233,7 @@ class ClashRoyaleAnalyzer:
     
     def save_player_info(self, player_data: Dict):
         """Save player information to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         clan_info = player_data.get('clan', {})
@@ -240,38 +258,39 @@ class ClashRoyaleAnalyzer:
     
     def save_clan_members(self, clan_data: Dict):
         """Save clan member information to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         clan_tag = clan_data['tag']
         clan_name = clan_data['name']
-        
-        for member in clan_data.get('memberList', []):
-            cursor.execute("""
-                INSERT OR REPLACE INTO clan_members 
-                (player_tag, name, role, level, trophies, donations, donations_received, 
-                 clan_tag, clan_name, last_seen, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                member['tag'],
-                member['name'],
-                member['role'],
-                member.get('expLevel', 0),
-                member.get('trophies', 0),
-                member.get('donations', 0),
-                member.get('donationsReceived', 0),
-                clan_tag,
-                clan_name,
-                member.get('lastSeen'),
-                datetime.now().isoformat()
-            ))
+        updated_at = datetime.now().isoformat()
+        
+        # One executemany for the whole roster instead of a statement per member
+        cursor.executemany("""
+            INSERT OR REPLACE INTO clan_members 
+            (player_tag, name, role, level, trophies, donations, donations_received, 
+             clan_tag, clan_name, last_seen, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(
+            member['tag'],
+            member['name'],
+            member['role'],
+            member.get('expLevel', 0),
+            member.get('trophies', 0),
+            member.get('donations', 0),
+            member.get('donationsReceived', 0),
+            clan_tag,
+            clan_name,
+            member.get('lastSeen'),
+            updated_at
+        ) for member in clan_data.get('memberList', [])])
         
         conn.commit()
         conn.close()
     
     def save_clan_rankings_history(self, clan_data: Dict):
         """Save clan rankings progression to track member performance over time"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         clan_tag = clan_data['tag']
@@ -333,7 +352,7 @@ class ClashRoyaleAnalyzer:
     
     def save_clan_member_deck_if_changed(self, player_data: Dict, clan_tag: str, clan_name: str):
         """Save clan member deck only if it has changed from the last recorded deck"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         player_tag = player_data['tag']
@@ -457,7 +476,7 @@ class ClashRoyaleAnalyzer:
     
     def save_battles(self, player_tag: str, battles: List[Dict]):
         """Save battle log to database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         for battle in battles:
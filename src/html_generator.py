@@ -6,1159 +6,488 @@ Generates Clash Royale analytics with relative paths for GitHub Pages
 
 import sqlite3
 import os
+import time
 import re
-from datetime import datetime, timezone
-from typing import List, Dict, Optional
+import json
+import hashlib
+import gzip
+import shutil
+from datetime import datetime, timedelta, timezone
+from string import Template
+from bisect import bisect_right
+from functools import lru_cache
+from contextlib import contextmanager
+from operator import itemgetter
+from types import MappingProxyType
+from typing import List, Dict, Optional, Iterator
 
-class GitHubPagesHTMLGenerator:
-    def __init__(self, db_path: str = "clash_royale.db"):
-        self.db_path = db_path
-        
-        # Card name mapping for file names (GitHub Pages uses relative paths)
-        self.card_name_mapping = {
-            'Three Musketeers': '3M',
-            'Archer Queen': 'ArcherQueen',
-            'Baby Dragon': 'BabyD',
-            'Barbarian Barrel': 'BarbBarrel',
-            'Barbarians': 'Barbs',
-            'Battle Healer': 'BattleHealer',
-            'Goblin Barrel': 'Barrel',
-            'Bomb Tower': 'BombTower',
-            'Boss Bandit': 'BossBandit',
-            'Cannon Cart': 'CannonCart',
-            'Dark Prince': 'DarkPrince',
-            'Dart Goblin': 'DartGob',
-            'Electro Giant': 'ElectroGiant',
-            'Electro Spirit': 'ElectroSpirit',
-            'Elixir Golem': 'ElixirGolem',
-            'Executioner': 'Exe',
-            'Fire Spirit': 'FireSpirit',
-            'Flying Machine': 'FlyingMachine',
-            'Goblin Gang': 'GobGang',
-            'Goblin Giant': 'GobGiant',
-            'Goblin Hut': 'GobHut',
-            'Goblin Cage': 'GoblinCage',
-            'Goblin Curse': 'GoblinCurse',
-            'Goblin Demolisher': 'GoblinDemolisher',
-            'Goblin Drill': 'GoblinDrill',
-            'Goblin Machine': 'GoblinMachine',
-            'Spear Goblins': 'Gobs',
-            'Golden Knight': 'GoldenKnight',
-            'Giant Skeleton': 'GiantSkelly',
-            'Heal Spirit': 'HealSpirit',
-            'Hog Rider': 'Hog',
-            'Minion Horde': 'Horde',
-            'Ice Golem': 'IceGolem',
-            'Ice Spirit': 'IceSpirit',
-            'Ice Wizard': 'IceWiz',
-            'Inferno Tower': 'Inferno',
-            'Inferno Dragon': 'InfernoD',
-            'Lava Hound': 'Lava',
-            'Little Prince': 'LittlePrince',
-            'The Log': 'Log',
-            'Lumberjack': 'Lumber',
-            'Mega Minion': 'MM',
-            'Mini P.E.K.K.A': 'MP',
-            'Magic Archer': 'MagicArcher',
-            'Mega Knight': 'MegaKnight',
-            'Mighty Miner': 'MightyMiner',
-            'Mother Witch': 'MotherWitch',
-            'Musketeer': 'Musk',
-            'Night Witch': 'NightWitch',
-            'P.E.K.K.A': 'PEKKA',
-            'Elixir Collector': 'Pump',
-            'Royal Giant': 'RG',
-            'Battle Ram': 'Ram',
-            'Ram Rider': 'RamRider',
-            'Royal Delivery': 'RoyalDelivery',
-            'Royal Hogs': 'RoyalHogs',
-            'Royal Recruits': 'RoyalRecruits',
-            'Skeleton Army': 'Skarmy',
-            'Skeleton Dragons': 'SkeletonDragons',
-            'Skeleton King': 'SkeletonKing',
-            'Skeletons': 'Skellies',
-            'Skeleton Barrel': 'SkellyBarrel',
-            'Giant Snowball': 'Snowball',
-            'Spear Goblins': 'SpearGobs',
-            'Spirit Empress': 'SpiritEmpress',
-            'Suspicious Bush': 'SuspiciousBush',
-            'Valkyrie': 'Valk',
-            'Wall Breakers': 'WallBreakers',
-            'Wizard': 'Wiz',
-            'X-Bow': 'XBow',
-            'Elite Barbarians': 'eBarbs',
-            'Electro Dragon': 'eDragon',
-            'Electro Wizard': 'eWiz'
-        }
-    
-    def get_card_filename(self, card_name: str) -> str:
-        """Convert card name to filename"""
-        return self.card_name_mapping.get(card_name, card_name.replace(' ', '').replace('.', '').replace('-', ''))
-    
-    def safe_filename(self, name: str) -> str:
-        """Convert member name to safe filename"""
-        # Remove special characters and spaces
-        safe_name = re.sub(r'[^\w\s-]', '', name)
-        safe_name = re.sub(r'\s+', '_', safe_name)
-        return safe_name.lower()
-    
-    def get_card_image_path(self, card_name: str) -> str:
-        """Get the relative path to card image for GitHub Pages"""
-        filename = self.get_card_filename(card_name)
-        
-        # Try normal cards first
-        normal_path = f"cards/normal_cards/{filename}.png"
-        evolution_path = f"cards/evolution_cards/{filename}.png"
-        
-        # Check if files exist (look in parent directory when running from src/)
-        cards_base = "../cards" if os.path.exists("../cards") else "cards"
-        
-        if os.path.exists(f"{cards_base}/normal_cards/{filename}.png"):
-            return normal_path
-        elif os.path.exists(f"{cards_base}/evolution_cards/{filename}.png"):
-            return evolution_path
-        else:
-            # Fallback to placeholder
-            return f"https://via.placeholder.com/100x120/7B68EE/FFFFFF?text={card_name.replace(' ', '+')}"
-    
-    def get_player_stats(self) -> Optional[Dict]:
-        """Get player statistics from database"""
-        if not os.path.exists(self.db_path):
-            return None
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get player info
-        cursor.execute("SELECT * FROM players ORDER BY last_updated DESC LIMIT 1")
-        player_row = cursor.fetchone()
-        
-        if not player_row:
-            conn.close()
-            return None
-            
-        # Get battle stats
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_battles,
-                SUM(CASE WHEN result = 'victory' THEN 1 ELSE 0 END) as wins,
-                SUM(CASE WHEN result = 'defeat' THEN 1 ELSE 0 END) as losses,
-                SUM(CASE WHEN result = 'draw' THEN 1 ELSE 0 END) as draws,
-                SUM(COALESCE(trophy_change, 0)) as total_trophy_change,
-                MAX(battle_time) as last_battle,
-                MIN(battle_time) as first_battle
-            FROM battles
-        """)
-        battle_stats = cursor.fetchone()
-        
-        conn.close()
-        
-        return {
-            'player_tag': player_row[0],
-            'name': player_row[1],
-            'trophies': player_row[2],
-            'best_trophies': player_row[3],
-            'level': player_row[4],
-            'clan_tag': player_row[5],
-            'clan_name': player_row[6],
-            'last_updated': player_row[7],
-            'total_battles': battle_stats[0] or 0,
-            'wins': battle_stats[1] or 0,
-            'losses': battle_stats[2] or 0,
-            'draws': battle_stats[3] or 0,
-            'total_trophy_change': battle_stats[4] or 0,
-            'last_battle': battle_stats[5],
-            'first_battle': battle_stats[6]
-        }
-    
-    def get_deck_performance(self, limit: int = 10) -> List[Dict]:
-        """Get deck performance data"""
-        if not os.path.exists(self.db_path):
-            return []
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM deck_performance 
-            WHERE total_battles >= 3
-            ORDER BY win_rate DESC, total_battles DESC
-            LIMIT ?
-        """, (limit,))
-        
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
-    
-    def get_card_level_analytics(self) -> Dict:
-        """Get card level analytics from enhanced battle data"""
-        if not os.path.exists(self.db_path):
-            return {}
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if new columns exist
-        cursor.execute("PRAGMA table_info(battles)")
-        columns = [col[1] for col in cursor.fetchall()]
-        if 'deck_card_levels' not in columns:
-            conn.close()
-            return {'message': 'Enhanced battle data not available yet. Will be collected from next battles.'}
-        
-        analytics = {}
-        
-        # Average card levels over time
-        cursor.execute("""
-            SELECT deck_card_levels, opponent_deck_card_levels, player_level, opponent_level, result
-            FROM battles 
-            WHERE deck_card_levels IS NOT NULL 
-            ORDER BY battle_time DESC 
-            LIMIT 50
-        """)
-        
-        battles = cursor.fetchall()
-        if battles:
-            total_player_level = 0
-            total_opponent_level = 0
-            level_advantage_wins = 0
-            level_disadvantage_wins = 0
-            total_with_levels = 0
-            
-            for battle in battles:
-                player_level = battle[2]
-                opponent_level = battle[3]
-                result = battle[4]
-                
-                if player_level and opponent_level:
-                    total_player_level += player_level
-                    total_opponent_level += opponent_level
-                    total_with_levels += 1
-                    
-                    if result == 'victory':
-                        if player_level > opponent_level:
-                            level_advantage_wins += 1
-                        elif player_level < opponent_level:
-                            level_disadvantage_wins += 1
-            
-            if total_with_levels > 0:
-                analytics['avg_player_level'] = round(total_player_level / total_with_levels, 1)
-                analytics['avg_opponent_level'] = round(total_opponent_level / total_with_levels, 1)
-                analytics['level_advantage_wins'] = level_advantage_wins
-                analytics['level_disadvantage_wins'] = level_disadvantage_wins
-                analytics['total_with_levels'] = total_with_levels
-        
-        # Opponent clan analysis
-        cursor.execute("""
-            SELECT opponent_clan_name, COUNT(*) as battles, 
-                   SUM(CASE WHEN result = 'victory' THEN 1 ELSE 0 END) as wins
-            FROM battles 
-            WHERE opponent_clan_name IS NOT NULL 
-            GROUP BY opponent_clan_name 
-            ORDER BY battles DESC 
-            LIMIT 10
-        """)
-        
-        clan_battles = cursor.fetchall()
-        analytics['opponent_clans'] = [
-            {'name': row[0], 'battles': row[1], 'wins': row[2], 'win_rate': round((row[2] / row[1]) * 100, 1)}
-            for row in clan_battles
-        ]
-        
-        conn.close()
-        return analytics
-
-    def get_recent_battles(self, limit: int = 15) -> List[Dict]:
-        """Get recent battle data"""
-        if not os.path.exists(self.db_path):
-            return []
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT battle_time, result, opponent_name, opponent_tag, 
-                   crowns, trophy_change, deck_cards, arena_name
-            FROM battles 
-            ORDER BY battle_time DESC 
-            LIMIT ?
-        """, (limit,))
-        
-        battles = []
-        for row in cursor.fetchall():
-            battles.append({
-                'battle_time': row[0],
-                'result': row[1],
-                'opponent_name': row[2] or 'Unknown',
-                'opponent_tag': row[3] or '',
-                'crowns': row[4] or 0,
-                'trophy_change': row[5] or 0,
-                'deck_cards': row[6] or '',
-                'arena_name': row[7] or 'Unknown'
-            })
-        
-        conn.close()
-        return battles
-    
-    def get_clan_members(self) -> List[Dict]:
-        """Get clan member data"""
-        if not os.path.exists(self.db_path):
-            return []
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT name, role, trophies, donations, donations_received, last_seen
-            FROM clan_members 
-            ORDER BY 
-                CASE role 
-                    WHEN 'leader' THEN 1 
-                    WHEN 'coLeader' THEN 2 
-                    WHEN 'elder' THEN 3 
-                    ELSE 4 
-                END,
-                trophies DESC
-        """)
-        
-        members = []
-        for row in cursor.fetchall():
-            members.append({
-                'name': row[0],
-                'role': row[1],
-                'trophies': row[2] or 0,
-                'donations': row[3] or 0,
-                'donations_received': row[4] or 0,
-                'last_seen': row[5]
-            })
-        
-        conn.close()
-        return members
-    
-    def get_daily_battle_stats(self, days_limit: int = 30) -> List[Dict]:
-        """Get daily wins/losses aggregation for histogram, including days with no battles"""
-        if not os.path.exists(self.db_path):
-            return []
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # First, create a complete date range for the last N days
-        cursor.execute("""
-            WITH RECURSIVE date_range(date) AS (
-                SELECT DATE('now', '-' || ? || ' days')
-                UNION ALL
-                SELECT DATE(date, '+1 day')
-                FROM date_range
-                WHERE date < DATE('now')
-            )
-            SELECT 
-                dr.date as battle_date,
-                COALESCE(SUM(CASE WHEN b.result = 'victory' THEN 1 ELSE 0 END), 0) as wins,
-                COALESCE(SUM(CASE WHEN b.result = 'defeat' THEN 1 ELSE 0 END), 0) as losses,
-                COALESCE(SUM(CASE WHEN b.result = 'draw' THEN 1 ELSE 0 END), 0) as draws,
-                COALESCE(COUNT(b.id), 0) as total_battles
-            FROM date_range dr
-            LEFT JOIN battles b ON 
-                SUBSTR(b.battle_time, 1, 4) || '-' || SUBSTR(b.battle_time, 5, 2) || '-' || SUBSTR(b.battle_time, 7, 2) = dr.date
-                AND b.battle_time IS NOT NULL
-            GROUP BY dr.date
-            ORDER BY dr.date ASC
-        """, (days_limit - 1,))  # -1 because we include today
-        
-        daily_stats = []
-        for row in cursor.fetchall():
-            daily_stats.append({
-                'date': row[0],
-                'wins': row[1] or 0,
-                'losses': row[2] or 0,
-                'draws': row[3] or 0,
-                'total_battles': row[4] or 0
-            })
-        
-        conn.close()
-        return daily_stats
-    
-    def get_clan_rankings_data(self, days_limit: int = 7) -> List[Dict]:
-        """Get latest clan rankings with progression data"""
-        if not os.path.exists(self.db_path):
-            return []
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clan_rankings_history'")
-        if not cursor.fetchone():
-            conn.close()
-            return []
-        
-        # Get latest rankings
-        cursor.execute("""
-            SELECT 
-                crh.player_tag,
-                crh.name,
-                crh.clan_rank,
-                crh.trophies,
-                crh.donations,
-                crh.donations_received,
-                crh.trophy_change,
-                crh.donation_change,
-                crh.recorded_at,
-                cm.role,
-                cm.last_seen
-            FROM clan_rankings_history crh
-            LEFT JOIN clan_members cm ON crh.player_tag = cm.player_tag
-            WHERE crh.recorded_at = (
-                SELECT MAX(recorded_at) 
-                FROM clan_rankings_history 
-                WHERE player_tag = crh.player_tag
-            )
-            ORDER BY crh.clan_rank ASC
-        """)
-        
-        rankings = []
-        for row in cursor.fetchall():
-            rankings.append({
-                'player_tag': row[0],
-                'name': row[1],
-                'clan_rank': row[2],
-                'trophies': row[3] or 0,
-                'donations': row[4] or 0,
-                'donations_received': row[5] or 0,
-                'trophy_change': row[6] or 0,
-                'donation_change': row[7] or 0,
-                'recorded_at': row[8],
-                'role': row[9] or 'member',
-                'last_seen': row[10]
-            })
-        
-        conn.close()
-        return rankings
-    
-    def get_player_clan_progression(self, player_tag: str, days_limit: int = 30) -> List[Dict]:
-        """Get specific player's clan ranking progression over time"""
-        if not os.path.exists(self.db_path):
-            return []
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                DATE(recorded_at) as date,
-                clan_rank,
-                trophies,
-                trophy_change,
-                donations,
-                donation_change
-            FROM clan_rankings_history 
-            WHERE player_tag = ?
-                AND DATE(recorded_at) >= DATE('now', '-' || ? || ' days')
-            ORDER BY recorded_at DESC
-            LIMIT ?
-        """, (player_tag, days_limit, days_limit))
-        
-        progression = []
-        for row in cursor.fetchall():
-            progression.append({
-                'date': row[0],
-                'clan_rank': row[1],
-                'trophies': row[2] or 0,
-                'trophy_change': row[3] or 0,
-                'donations': row[4] or 0,
-                'donation_change': row[5] or 0
-            })
-        
-        conn.close()
-        return progression
-    
-    def get_clan_deck_analytics(self) -> Dict:
-        """Get clan-wide deck and card analytics"""
-        if not os.path.exists(self.db_path):
-            return {}
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clan_member_decks'")
-        if not cursor.fetchone():
-            conn.close()
-            return {}
-        
-        analytics = {}
-        
-        # Most popular current decks
-        cursor.execute("""
-            SELECT deck_cards, COUNT(*) as usage_count, 
-                   GROUP_CONCAT(name, ', ') as users
-            FROM (
-                SELECT DISTINCT player_tag, deck_cards, name
-                FROM clan_member_decks cmd1
-                WHERE cmd1.id = (
-                    SELECT MAX(cmd2.id) 
-                    FROM clan_member_decks cmd2 
-                    WHERE cmd2.player_tag = cmd1.player_tag
-                )
-            )
-            GROUP BY deck_cards
-            ORDER BY usage_count DESC, deck_cards
-            LIMIT 10
-        """)
-        
-        popular_decks = []
-        for row in cursor.fetchall():
-            popular_decks.append({
-                'deck_cards': row[0],
-                'usage_count': row[1],
-                'users': row[2]
-            })
-        analytics['popular_decks'] = popular_decks
-        
-        # Most popular favorite cards
-        cursor.execute("""
-            SELECT favorite_card, COUNT(*) as usage_count,
-                   GROUP_CONCAT(name, ', ') as users
-            FROM (
-                SELECT DISTINCT player_tag, favorite_card, name
-                FROM clan_member_decks cmd1
-                WHERE favorite_card != ''
-                  AND cmd1.id = (
-                    SELECT MAX(cmd2.id) 
-                    FROM clan_member_decks cmd2 
-                    WHERE cmd2.player_tag = cmd1.player_tag
-                )
-            )
-            GROUP BY favorite_card
-            ORDER BY usage_count DESC
-            LIMIT 10
-        """)
-        
-        favorite_cards = []
-        for row in cursor.fetchall():
-            favorite_cards.append({
-                'card_name': row[0],
-                'usage_count': row[1],
-                'users': row[2]
-            })
-        analytics['favorite_cards'] = favorite_cards
-        
-        # Deck change frequency by player (counting only actual deck composition changes)
-        cursor.execute("""
-            WITH DeckChanges AS (
-                SELECT 
-                    player_tag,
-                    name,
-                    deck_cards,
-                    MIN(first_seen) as first_seen,
-                    MAX(last_seen) as last_seen,
-                    ROW_NUMBER() OVER (PARTITION BY player_tag ORDER BY MIN(first_seen)) as deck_sequence
-                FROM clan_member_decks
-                GROUP BY player_tag, name, deck_cards
-            )
-            SELECT 
-                player_tag, 
-                name, 
-                COUNT(*) as deck_changes,
-                MIN(first_seen) as first_deck,
-                MAX(last_seen) as latest_deck
-            FROM DeckChanges
-            GROUP BY player_tag, name
-            ORDER BY deck_changes DESC
-        """)
-        
-        deck_experimenters = []
-        for row in cursor.fetchall():
-            deck_experimenters.append({
-                'player_tag': row[0],
-                'name': row[1],
-                'deck_changes': row[2],
-                'first_deck': row[3],
-                'latest_deck': row[4]
-            })
-        analytics['deck_experimenters'] = deck_experimenters
-        
-        conn.close()
-        return analytics
-    
-    def format_time_ago(self, timestamp: str) -> str:
-        """Format timestamp as time ago"""
-        if not timestamp or timestamp == 'never':
-            return "never"
-            
-        try:
-            if 'T' in timestamp:
-                if timestamp.endswith('Z'):
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                else:
-                    dt = datetime.fromisoformat(timestamp)
-            else:
-                dt = datetime.fromisoformat(timestamp)
-                
-            now = datetime.now(timezone.utc)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-                
-            time_diff = now - dt
-            
-            if time_diff.days > 0:
-                return f"{time_diff.days} days ago"
-            elif time_diff.seconds > 3600:
-                hours = time_diff.seconds // 3600
-                return f"{hours} hours ago"
-            elif time_diff.seconds > 60:
-                minutes = time_diff.seconds // 60
-                return f"{minutes} minutes ago"
-            else:
-                return "just now"
-        except:
-            return "unknown"
-    
-    def format_date(self, timestamp: str) -> str:
-        """Format timestamp as readable date"""
-        if not timestamp:
-            return "unknown"
-            
-        try:
-            if 'T' in timestamp:
-                if timestamp.endswith('Z'):
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                else:
-                    dt = datetime.fromisoformat(timestamp)
-            else:
-                dt = datetime.fromisoformat(timestamp)
-                
-            return dt.strftime('%B %d, %Y')
-        except:
-            return "unknown"
-    
-    def generate_deck_cards_html(self, deck_cards: str, show_names: bool = True) -> str:
-        """Generate HTML for deck cards with images"""
-        if not deck_cards:
-            return ""
-        
-        cards = deck_cards.split(' | ')
-        cards_html = ""
-        
-        for card in cards:
-            img_path = self.get_card_image_path(card)
-            name_html = f'<div class="card-name">{card}</div>' if show_names else ''
-            if show_names:
-                cards_html += f"""
-                <div class="card-container">
-                    <img src="{img_path}" alt="{card}" class="card-image" title="{card}" loading="lazy">
-                    {name_html}
-                </div>
-            """
-            else:
-                cards_html += f'<div class="card-container"><img src="{img_path}" alt="{card}" class="card-image" title="{card}" loading="lazy">{name_html}</div>'
-        
-        css_class = "deck-cards-compact" if not show_names else "deck-cards"
-        return f'<div class="{css_class}">{cards_html}</div>'
-    
-    def generate_daily_histogram_html(self, daily_stats: List[Dict], css_class: str = "", include_legend: bool = True) -> str:
-        """Generate HTML for daily wins/losses stacked histogram"""
-        if not daily_stats:
-            return "<p>No daily battle data available for histogram.</p>"
-        
-        # Find max battles for scaling
-        max_battles = max((day['total_battles'] for day in daily_stats), default=1)
-        
-        # Create custom stacked histogram
-        histogram_html = f'''
-            <div class="chart-container {css_class}">
-                <div class="stacked-histogram">
-        '''
-        
-        for day in daily_stats:
-            wins = day['wins']
-            losses = day['losses']
-            draws = day['draws']
-            total = day['total_battles']
-            date = day['date']
-            
-            # Calculate heights as percentages of max battles
-            if total == 0:
-                win_height = 0
-                loss_height = 0
-                draw_height = 2  # Minimal height for empty days
-            else:
-                # Scale based on max battles, with minimum heights for visibility
-                scale_factor = (total / max_battles) * 180  # 180px max height
-                win_height = max((wins / total) * scale_factor, 1 if wins > 0 else 0)
-                loss_height = max((losses / total) * scale_factor, 1 if losses > 0 else 0)
-                draw_height = max((draws / total) * scale_factor, 1 if draws > 0 else 0)
-            
-            # Create tooltip
-            tooltip = f"{date}: {wins}W/{losses}L/{draws}D" if total > 0 else f"{date}: No battles"
-            
-            histogram_html += f'''
-                <div class="histogram-bar" title="{tooltip}">
-                    <div class="bar-date">{date[-2:]}</div>
-                    <div class="bar-stack">
-            '''
-            
-            # Add segments from bottom to top: losses, draws, wins
-            if loss_height > 0:
-                histogram_html += f'''
-                    <div class="bar-segment bar-losses" style="height: {loss_height}px;">
-                        {f'<span class="segment-value">{losses}</span>' if losses > 0 else ''}
-                    </div>
-                '''
-            
-            if draw_height > 0:
-                histogram_html += f'''
-                    <div class="bar-segment bar-draws" style="height: {draw_height}px;">
-                        {f'<span class="segment-value">{draws}</span>' if draws > 0 else ''}
-                    </div>
-                '''
-            
-            if win_height > 0:
-                histogram_html += f'''
-                    <div class="bar-segment bar-wins" style="height: {win_height}px;">
-                        {f'<span class="segment-value">{wins}</span>' if wins > 0 else ''}
-                    </div>
-                '''
-            
-            # Handle empty days
-            if total == 0:
-                histogram_html += f'''
-                    <div class="bar-segment bar-empty" style="height: {draw_height}px;">
-                    </div>
-                '''
-            
-            histogram_html += '''
-                    </div>
-                </div>
-            '''
-        
-        histogram_html += '''
-                </div>
+# Clan role -> CSS class suffix and display label
+_ROLE_CLASS = {
+    'leader': 'leader',
+    'coLeader': 'co-leader',
+    'elder': 'elder',
+    'member': 'member'
+}
+
+_ROLE_DISPLAY = {
+    'leader': 'leader',
+    'coLeader': 'Co-Leader',
+    'elder': 'elder',
+    'member': 'member'
+}
+
+# Number formatters bound once and shared by the template field builders
+_intcomma = '{:,}'.format
+_signed = '{:+d}'.format
+_fixed1 = '{:.1f}'.format
+
+# HTML-escape table for user-controlled text (player, clan and card names); same
+# entities as html.escape(quote=True), applied in one str.translate pass
+_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;'})
+
+def _esc(text: str) -> str:
+    """Escape text for HTML element content and quoted attribute values"""
+    return text.translate(_ESCAPE_TABLE)
+
+# Plural suffix indexed by the count check: _PLURAL_S[n != 1]
+_PLURAL_S = ('', 's')
+
+# Trophy/donation delta badges indexed by sign: [(d > 0) + 2 * (d < 0)] -> neutral, up, down
+_TROPHY_INDICATOR = ('<span class="trophy-neutral">0</span>'.format,
+                     '<span class="trophy-up">+{}</span>'.format,
+                     '<span class="trophy-down">{}</span>'.format)
+_DONATION_INDICATOR = ('<span class="donation-neutral">0</span>'.format,
+                       '<span class="donation-up">+{}</span>'.format,
+                       '<span class="donation-down">{}</span>'.format)
+
+# Set CR_HISTORY_MOBILE=0 for a desktop-only build: skips the mobile member cards and 7-day histogram
+_INCLUDE_MOBILE = os.getenv("CR_HISTORY_MOBILE", "1") == "1"
+
+# Output write buffer: the whole report fits, so it goes out in one or two write() calls.
+# 0.5-1 MiB is the measured sweet spot; multi-MiB buffers were slower, don't raise it further.
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Characters dropped from card names to form image filenames, in one translate() pass
+_FILENAME_STRIP = str.maketrans('', '', ' .-')
+
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+
+def _compile_template(source: str) -> Template:
+    """Minify template markup once at import: drop HTML comments, indentation and blank lines"""
+    source = _HTML_COMMENT_RE.sub('', source)
+    lines = (line.strip() for line in source.splitlines())
+    return Template('\n'.join(line for line in lines if line) + '\n')
+
+# Set CR_HISTORY_PRETTY_CSS=1 to ship the stylesheets as written instead of minified
+_PRETTY_CSS = os.getenv("CR_HISTORY_PRETTY_CSS", "0") == "1"
+
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r' ?([{};:,>]) ?')
+
+def _minify_css(source: str) -> str:
+    """Drop comments and whitespace around punctuation"""
+    css = _CSS_COMMENT_RE.sub('', source)
+    css = _CSS_SPACE_RE.sub(' ', css)
+    css = _CSS_PUNCT_RE.sub(r'\1', css)
+    return css.replace(';}', '}').strip()
+
+# Shared palette, written as $name in the stylesheet sources and filled in by _compile_css
+_CSS_PALETTE = MappingProxyType({
+    'text': '#2d3748',
+    'muted': '#718096',
+    'accent': '#4299e1',
+    'card_bg': 'rgba(255, 255, 255, 0.9)',
+    'shadow_sm': '0 1px 4px rgba(0, 0, 0, 0.1)',
+    'shadow': '0 2px 8px rgba(0, 0, 0, 0.1)',
+})
+
+def _compile_css(source: str) -> str:
+    """Fill in the palette and minify a stylesheet once at class creation (as written with CR_HISTORY_PRETTY_CSS=1)"""
+    source = Template(source).substitute(_CSS_PALETTE)
+    return source if _PRETTY_CSS else _minify_css(source)
+
+# Classes styling the report header and stat cards: the first paint before the full stylesheet loads
+_CRITICAL_CLASSES = frozenset({'container', 'header', 'player-info', 'player-stats', 'stat-card', 'value'})
+_CRITICAL_ELEMENTS = frozenset({'*', 'html', 'body', 'h1', 'h2', 'h3', 'p', 'small', 'strong'})
+_CSS_CLASS_RE = re.compile(r'\.([\w-]+)')
+
+def _is_critical_selector(selectors: str) -> bool:
+    """True if every selector in the list only targets header/stat-card markup"""
+    for selector in selectors.split(','):
+        classes = _CSS_CLASS_RE.findall(selector)
+        if classes:
+            if not _CRITICAL_CLASSES.issuperset(classes):
+                return False
+        elif selector.split(':', 1)[0] not in _CRITICAL_ELEMENTS:
+            return False
+    return True
+
+def _critical_css(css: str) -> str:
+    """Pick the above-the-fold rules (and @font-face) out of minified CSS, keeping @media wrappers"""
+    out = []
+    pos = 0
+    while pos < len(css):
+        brace = css.index('{', pos)
+        prelude = css[pos:brace]
+        if prelude.startswith('@media'):
+            depth, end = 1, brace + 1
+            while depth:
+                depth += {'{': 1, '}': -1}.get(css[end], 0)
+                end += 1
+            inner = _critical_css(css[brace + 1:end - 1])
+            if inner:
+                out.append(f'{prelude}{{{inner}}}')
+        else:
+            end = css.index('}', brace) + 1
+            if prelude.startswith('@font-face') or _is_critical_selector(prelude):
+                out.append(css[pos:end])
+        pos = end
+    return ''.join(out)
+
+# Clan member columns unpacked once per row in the member table loops
+_MEMBER_COLUMNS = itemgetter('name', 'role_class', 'role_display', 'trophies_display', 'donations', 'donations_received', 'last_seen')
+
+# Row/card fragments, parsed once at import and filled per row with substitute()
+_DECK_ITEM_TMPL = _compile_template("""
+    <div class="deck-item">
+        <div class="deck-header">
+            <h3>#$rank - $win_rate% Win Rate</h3>
+            <div class="deck-stats">
+                <span class="stat">🏆 $total_battles battles</span>
+                <span class="stat">✅ $wins wins</span>
+                <span class="stat">❌ $losses losses</span>
+                <span class="stat" style="color: $trophy_color">📈 $trophy_change trophies</span>
+                <span class="stat">👑 $avg_crowns avg crowns</span>
             </div>
-        '''
-        
-        # Add legend only if requested
-        legend_html = ""
-        if include_legend:
-            legend_html = '''
-            <div class="histogram-legend">
-                <div class="legend-item">
-                    <span class="legend-color legend-wins"></span>
-                    <span>Wins</span>
+        </div>
+        $deck_cards_html
+    </div>
+""")
+
+_CLAN_ROW_TMPL = _compile_template("""
+    <tr class="$row_class">
+        <td>$member_link</td>
+        <td><span class="role-$role_class">$role_display</span></td>
+        <td>$trophies</td>
+        <td>$donations↑ $donations_received↓</td>
+        <td>$deck_changes</td>
+        <td>$last_seen</td>
+    </tr>
+""")
+
+_CLAN_CARD_TMPL = _compile_template("""
+    <div class="clan-member-card $card_class">
+        <div class="member-card-header">
+            <strong class="member-name">$member_link</strong>
+            <span class="role-$role_class member-role">$role_display</span>
+        </div>
+        <div class="member-card-content">
+            <div class="member-stats">
+                <span class="trophy-count">🏆 $trophies</span>
+                <span class="donation-stats">📦 $donations↑ $donations_received↓</span>
+                <span class="deck-changes">🔄 $deck_changes deck changes</span>
+            </div>
+            <div class="member-activity">
+                <span class="last-seen">🕒 $last_seen</span>
+            </div>
+        </div>
+    </div>
+""")
+
+_RANKING_ITEM_TMPL = _compile_template("""
+    <div class="ranking-item $row_class">
+        <div class="ranking-position">#$clan_rank</div>
+        <div class="ranking-info">
+            <div class="ranking-header">
+                <span class="member-name">$name</span>
+                <span class="role-$role_class member-role">$role_display</span>
+            </div>
+            <div class="ranking-stats">
+                <div class="stat-group">
+                    <span class="trophy-count">🏆 $trophies</span>
+                    $trophy_indicator
                 </div>
-                <div class="legend-item">
-                    <span class="legend-color legend-losses"></span>
-                    <span>Losses</span>
+                <div class="stat-group">
+                    <span class="donation-count">📦 $donations↑ $donations_received↓</span>
+                    $donation_indicator
                 </div>
-            </div>
-            '''
-        
-        return histogram_html + legend_html
-    
-    def generate_clan_rankings_html(self, clan_rankings: List[Dict], player_name: str) -> str:
-        """Generate HTML for clan rankings with progression indicators"""
-        if not clan_rankings:
-            return "<p>No clan rankings data available.</p>"
-        
-        rankings_html = '<div class="clan-rankings">'
-        
-        for member in clan_rankings:
-            is_current_player = member['name'] == player_name
-            row_class = "current-player-ranking" if is_current_player else ""
-            
-            # Trophy change indicator
-            trophy_change = member['trophy_change']
-            trophy_indicator = ""
-            if trophy_change > 0:
-                trophy_indicator = f'<span class="trophy-up">+{trophy_change}</span>'
-            elif trophy_change < 0:
-                trophy_indicator = f'<span class="trophy-down">{trophy_change}</span>'
-            else:
-                trophy_indicator = '<span class="trophy-neutral">0</span>'
-            
-            # Donation change indicator
-            donation_change = member['donation_change']
-            donation_indicator = ""
-            if donation_change > 0:
-                donation_indicator = f'<span class="donation-up">+{donation_change}</span>'
-            elif donation_change < 0:
-                donation_indicator = f'<span class="donation-down">{donation_change}</span>'
-            else:
-                donation_indicator = '<span class="donation-neutral">0</span>'
-            
-            role_class = {
-                'leader': 'leader',
-                'coLeader': 'co-leader', 
-                'elder': 'elder',
-                'member': 'member'
-            }.get(member['role'], 'member')
-            
-            role_display = member['role'].replace('coLeader', 'Co-Leader')
-            
-            rankings_html += f'''
-                <div class="ranking-item {row_class}">
-                    <div class="ranking-position">#{member['clan_rank']}</div>
-                    <div class="ranking-info">
-                        <div class="ranking-header">
-                            <span class="member-name">{member['name']}</span>
-                            <span class="role-{role_class} member-role">{role_display}</span>
-                        </div>
-                        <div class="ranking-stats">
-                            <div class="stat-group">
-                                <span class="trophy-count">🏆 {member['trophies']:,}</span>
-                                {trophy_indicator}
-                            </div>
-                            <div class="stat-group">
-                                <span class="donation-count">📦 {member['donations']}↑ {member['donations_received']}↓</span>
-                                {donation_indicator}
-                            </div>
-                            <div class="last-seen-info">
-                                🕒 {self.format_time_ago(member['last_seen'])}
-                            </div>
-                        </div>
-                    </div>
+                <div class="last-seen-info">
+                    🕒 $last_seen
                 </div>
-            '''
-        
-        rankings_html += '</div>'
-        return rankings_html
-    
-    def generate_clan_deck_analytics_html(self, deck_analytics: Dict) -> str:
-        """Generate HTML for clan deck analytics"""
-        if not deck_analytics:
-            return "<p>No clan deck data available yet. Data will appear after the next hourly collection.</p>"
-        
-        html = ""
-        
-        # Popular decks section - REMOVED: Most Popular Clan Decks section
-        # popular_decks = deck_analytics.get('popular_decks', [])
-        # if popular_decks:
-        #     html += '<div class="analytics-section"><h3>🎯 Most Popular Clan Decks</h3>'
-        #     for i, deck in enumerate(popular_decks[:5], 1):
-        #         deck_cards_html = self.generate_deck_cards_html(deck['deck_cards'], show_names=False)
-        #         html += f'''
-        #             <div class="popular-deck-item">
-        #                 <div class="deck-popularity">
-        #                     <span class="deck-rank">#{i}</span>
-        #                     <div class="deck-info">
-        #                         <span class="usage-count">{deck['usage_count']} member{"s" if deck['usage_count'] > 1 else ""}</span>
-        #                         <span class="users-list">{deck['users']}</span>
-        #                     </div>
-        #                 </div>
-        #                 {deck_cards_html}
-        #             </div>
-        #         '''
-        #     html += '</div>'
-        
-        # Favorite cards section
-        favorite_cards = deck_analytics.get('favorite_cards', [])
-        if favorite_cards:
-            html += '<div class="analytics-section"><h3>⭐ Most Popular Favorite Cards</h3>'
-            html += '<div class="favorite-cards-grid">'
-            for card in favorite_cards[:8]:
-                img_path = self.get_card_image_path(card['card_name'])
-                html += f'''
-                    <div class="favorite-card-item">
-                        <img src="{img_path}" alt="{card['card_name']}" class="favorite-card-image">
-                        <div class="favorite-card-info">
-                            <span class="card-name">{card['card_name']}</span>
-                            <span class="usage-count">{card['usage_count']} member{"s" if card['usage_count'] > 1 else ""}</span>
-                        </div>
-                    </div>
-                '''
-            html += '</div></div>'
-        
-        # Deck experimenters section - REMOVED: Moved to clan member activity table
-        # deck_experimenters = deck_analytics.get('deck_experimenters', [])
-        # if deck_experimenters:
-        #     html += '<div class="analytics-section"><h3>🔄 Deck Experimenters</h3>'
-        #     html += '<div class="experimenters-list">'
-        #     for member in deck_experimenters[:10]:
-        #         changes = member['deck_changes']
-        #         if changes > 1:  # Only show people who have changed decks
-        #             html += f'''
-        #                 <div class="experimenter-item">
-        #                     <span class="member-name">{member['name']}</span>
-        #                     <span class="change-count">{changes} deck change{"s" if changes > 1 else ""}</span>
-        #                 </div>
-        #             '''
-        #     html += '</div></div>'
-        
-        return html if html else "<p>No clan deck analytics available yet.</p>"
-    
-    def generate_card_level_analytics_html(self, analytics: Dict) -> str:
-        """Generate HTML for card level and opponent analytics"""
-        if not analytics:
-            return "<p>Enhanced battle analytics not available yet.</p>"
-        
-        if 'message' in analytics:
-            return f"<p style='color: #666; font-style: italic;'>{analytics['message']}</p>"
-        
-        html = ""
-        
-        # Player vs Opponent Level Analysis
-        if 'avg_player_level' in analytics:
-            html += '<div class="analytics-section">'
-            html += '<h3>⚖️ Level Matchmaking Analysis</h3>'
-            html += f'''
-                <div class="level-comparison">
-                    <div class="level-stat">
-                        <span class="level-label">Your Avg Level:</span>
-                        <span class="level-value">{analytics['avg_player_level']}</span>
-                    </div>
-                    <div class="level-stat">
-                        <span class="level-label">Opponent Avg Level:</span>
-                        <span class="level-value">{analytics['avg_opponent_level']}</span>
-                    </div>
+            </div>
+        </div>
+    </div>
+""")
+
+_LEVEL_COMPARISON_TMPL = _compile_template("""
+    <div class="level-comparison">
+        <div class="level-stat">
+            <span class="level-label">Your Avg Level:</span>
+            <span class="level-value">$avg_player_level</span>
+        </div>
+        <div class="level-stat">
+            <span class="level-label">Opponent Avg Level:</span>
+            <span class="level-value">$avg_opponent_level</span>
+        </div>
+    </div>
+    <div class="level-win-stats">
+        <div class="win-stat">
+            <span class="win-label">Wins with Level Advantage:</span>
+            <span class="win-count">$level_advantage_wins</span>
+        </div>
+        <div class="win-stat">
+            <span class="win-label">Wins with Level Disadvantage:</span>
+            <span class="win-count">$level_disadvantage_wins</span>
+        </div>
+    </div>
+""")
+
+_FAV_CARD_TMPL = _compile_template("""
+    <div class="favorite-card-item">
+        <img src="$img" alt="$name" class="favorite-card-image" width="50" height="60" loading="lazy" decoding="async">
+        <div class="favorite-card-info">
+            <span class="card-name">$name</span>
+            <span class="usage-count">$count member$s</span>
+        </div>
+    </div>
+""")
+
+# Opponent clan win-rate color indexed by win_rate >= 50: red, green
+_WIN_RATE_COLOR = ('#e53e3e', '#38a169')
+
+_OPPONENT_CLAN_TMPL = _compile_template("""
+    <div class="opponent-clan-item">
+        <div class="clan-name">$name</div>
+        <div class="clan-stats">
+            <span class="battles-count">$battles battles</span>
+            <span class="win-rate" style="color: $color">$win_rate% win rate</span>
+        </div>
+    </div>
+""")
+
+# Member names reduced to page filenames by safe_filename
+_UNSAFE_RE = re.compile(r'[^\w\s-]')
+_WS_RE = re.compile(r'\s+')
+
+# Deck card fragments, filled per card with str.format
+_CARD_COMPACT = '<div class="card-container"><img src="{p}" alt="{c}" class="card-image" title="{c}" width="50" height="60" loading="lazy" decoding="async"></div>'
+_CARD_NAMED = '<div class="card-container"><img src="{p}" alt="{c}" class="card-image" title="{c}" width="60" height="72" loading="lazy" decoding="async"><div class="card-name">{c}</div></div>'
+
+# Histogram bar fragments, %-formatted per day
+_HIST_BAR_HEAD = '<div class="histogram-bar" title="%s"><div class="bar-date">%s</div><div class="bar-stack">'
+_HIST_SEGMENT = '<div class="bar-segment %s" style="height: %spx;">%s</div>'
+_HIST_SEGMENT_VALUE = '<span class="segment-value">%d</span>'
+_HIST_EMPTY_SEGMENT = '<div class="bar-segment bar-empty" style="height: %spx;"></div>'
+_HIST_BAR_TAIL = '</div></div>'
+
+# Full report page; pre-split below so iter_full_html can stream it.
+# The Recent Battles, Clan Favorite Cards and Advanced Battle Analytics
+# sections are disabled; their renderers remain (generate_card_level_analytics_html,
+# generate_clan_favorite_cards_html) and the markup is in git history.
+_REPORT_TMPL = _compile_template("""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link rel="dns-prefetch" href="https://via.placeholder.com">
+    <title>Clash Royale Analytics - ${name}</title>
+    <link rel="icon" type="image/svg+xml" href="favicon.svg">
+    <link rel="alternate icon" href="/favicon.ico">
+    <style>$critical_css</style>
+    <link rel="preload" href="$stylesheet" as="style" onload="this.onload=null;this.rel='stylesheet'">
+    <noscript><link rel="stylesheet" href="$stylesheet"></noscript>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>⚔️ Clash Royale Battle Analytics</h1>
+            <div class="player-info">
+                <h2>${name} ($player_tag)</h2>
+                <p>Clan: $clan_name | Level: $level</p>
+                <p style="font-style: italic; color: #666; margin-top: 10px;">
+                    <strong>Player statistics since $first_battle</strong><br>
+                    Statistics are calculated from battles collected since data tracking began and do not reflect lifetime totals.
+                </p>
+            </div>
+            <div class="player-stats">
+                <div class="stat-card">
+                    <h3>Current Trophies</h3>
+                    <div class="value">$trophies</div>
+                    <small>Best: $best_trophies</small>
                 </div>
-                <div class="level-win-stats">
-                    <div class="win-stat">
-                        <span class="win-label">Wins with Level Advantage:</span>
-                        <span class="win-count">{analytics['level_advantage_wins']}</span>
-                    </div>
-                    <div class="win-stat">
-                        <span class="win-label">Wins with Level Disadvantage:</span>
-                        <span class="win-count">{analytics['level_disadvantage_wins']}</span>
-                    </div>
+                <div class="stat-card">
+                    <h3>Win Rate</h3>
+                    <div class="value">${win_rate}%</div>
+                    <small>${wins}W / ${losses}L</small>
                 </div>
-            '''
-            html += '</div>'
-        
-        # Opponent Clan Analysis
-        opponent_clans = analytics.get('opponent_clans', [])
-        if opponent_clans:
-            html += '<div class="analytics-section">'
-            html += '<h3>🏰 Opponent Clan Battles</h3>'
-            html += '<div class="opponent-clans-list">'
-            
-            for clan in opponent_clans[:5]:  # Show top 5
-                html += f'''
-                    <div class="opponent-clan-item">
-                        <div class="clan-name">{clan['name']}</div>
-                        <div class="clan-stats">
-                            <span class="battles-count">{clan['battles']} battles</span>
-                            <span class="win-rate" style="color: {'#38a169' if clan['win_rate'] >= 50 else '#e53e3e'}">{clan['win_rate']}% win rate</span>
-                        </div>
-                    </div>
-                '''
-            
-            html += '</div></div>'
-        
-        return html
-    
-    def generate_clan_favorite_cards_html(self, deck_analytics: Dict) -> str:
-        """Generate HTML for just clan favorite cards (for main page)"""
-        favorite_cards = deck_analytics.get('favorite_cards', [])
-        if not favorite_cards:
-            return "<p>No favorite card data available yet. <a href='clan.html' style='color: #4299e1;'>View full clan analytics →</a></p>"
-        
-        html = '<div class="favorite-cards-grid">'
-        for card in favorite_cards[:6]:  # Show only top 6 on main page
-            img_path = self.get_card_image_path(card['card_name'])
-            html += f'''
-                <div class="favorite-card-item">
-                    <img src="{img_path}" alt="{card['card_name']}" class="favorite-card-image">
-                    <div class="favorite-card-info">
-                        <span class="card-name">{card['card_name']}</span>
-                        <span class="usage-count">{card['usage_count']} member{"s" if card['usage_count'] > 1 else ""}</span>
-                    </div>
+                <div class="stat-card">
+                    <h3>Total Battles</h3>
+                    <div class="value">$total_battles</div>
+                    <small>$draws draws</small>
                 </div>
-            '''
-        html += '</div>'
-        
-        # Add link to full clan analytics
-        html += '<div style="text-align: center; margin-top: 15px;">'
-        html += '<a href="clan.html" style="color: #4299e1; text-decoration: none; font-weight: bold;">View Full Clan Analytics →</a>'
-        html += '</div>'
-        
-        return html
-    
-    def generate_clan_member_activity_html(self, clan_members: List[Dict], deck_analytics: Dict, player_name: str) -> str:
-        """Generate HTML for clan member activity section"""
-        if not clan_members:
-            return "<p>No clan member data available.</p>"
-        
-        # Create deck changes lookup
-        deck_changes_lookup = {}
-        if deck_analytics and 'deck_experimenters' in deck_analytics:
-            for experimenter in deck_analytics['deck_experimenters']:
-                deck_changes_lookup[experimenter['name']] = experimenter['deck_changes']
-        
-        # Generate clan member tables/cards (similar to clan_generator.py)
-        clan_table_html = ""
-        clan_cards_html = ""
-        
-        for member in clan_members[:20]:  # Show top 20 members
-            is_current_player = member['name'] == player_name
-            row_class = "current-player" if is_current_player else ""
-            card_class = "current-player-card" if is_current_player else ""
-            
-            role_class = {
-                'leader': 'leader',
-                'coLeader': 'co-leader', 
-                'elder': 'elder',
-                'member': 'member'
-            }.get(member['role'], 'member')
-            
-            role_display = member['role'].replace('coLeader', 'Co-Leader')
-            
-            # Create member filename and link
-            member_filename = f"member_{self.safe_filename(member['name'])}.html"
-            member_link = f'<a href="{member_filename}" style="color: #4299e1; text-decoration: none; font-weight: bold;">{member["name"]}</a>'
-            
-            # Get deck changes for this member
-            deck_changes = deck_changes_lookup.get(member['name'], 0)
-            
-            clan_table_html += f"""
-                <tr class="{row_class}">
-                    <td>{member_link}</td>
-                    <td><span class="role-{role_class}">{role_display}</span></td>
-                    <td>{member['trophies']:,}</td>
-                    <td>{member['donations']}↑ {member['donations_received']}↓</td>
-                    <td>{deck_changes}</td>
-                    <td>{self.format_time_ago(member['last_seen'])}</td>
-                </tr>
-            """
-            
-            clan_cards_html += f"""
-                <div class="clan-member-card {card_class}">
-                    <div class="member-card-header">
-                        <strong class="member-name">{member_link}</strong>
-                        <span class="role-{role_class} member-role">{role_display}</span>
-                    </div>
-                    <div class="member-card-content">
-                        <div class="member-stats">
-                            <span class="trophy-count">🏆 {member['trophies']:,}</span>
-                            <span class="donation-stats">📦 {member['donations']}↑ {member['donations_received']}↓</span>
-                            <span class="deck-changes">🔄 {deck_changes} deck changes</span>
-                        </div>
-                        <div class="member-activity">
-                            <span class="last-seen">🕒 {self.format_time_ago(member['last_seen'])}</span>
-                        </div>
-                    </div>
+                <div class="stat-card">
+                    <h3>Trophy Change</h3>
+                    <div class="value" style="color: $trophy_color">$trophy_change</div>
+                    <small>Total from battles</small>
                 </div>
-            """
-        
-        return f"""
+            </div>
+        </div>
+
         <div class="section">
-            <h2>🏰 Clan Member Activity</h2>
+            <h2>📊 Daily Battle Activity Log</h2>
             <p style="color: #666; margin-bottom: 15px; font-style: italic;">
-                Overview of clan member statistics and activity.
+                Daily battle history over the last 30 days. Green = wins, red = losses, orange = draws, gray = no battles. Hover for details.
             </p>
-            <div class="desktop-table">
-                <table id="clan-members-table">
-                    <thead>
-                        <tr>
-                            <th class="sortable" data-column="name">Name <span class="sort-indicator">↕</span></th>
-                            <th class="sortable" data-column="role">Role <span class="sort-indicator">↕</span></th>
-                            <th class="sortable" data-column="trophies">Trophies <span class="sort-indicator">↕</span></th>
-                            <th class="sortable" data-column="donations">Donations <span class="sort-indicator">↕</span></th>
-                            <th class="sortable" data-column="deck-changes">Deck Changes <span class="sort-indicator">↕</span></th>
-                            <th class="sortable" data-column="last-seen">Last Seen <span class="sort-indicator">↕</span></th>
-                        </tr>
-                    </thead>
-                    <tbody>{clan_table_html}</tbody>
-                </table>
-            </div>
-            <div class="clan-member-cards">{clan_cards_html}</div>
+            $daily_histogram_html
         </div>
-        """
+
+        <div class="section">
+            <h2>🏆 Top Performing Decks</h2>
+            $deck_performance_html
+        </div>
+
+        $clan_member_activity_html
+
+        <div class="footer">
+            <p>Report generated on $generated_at</p>
+            <p>Data last updated: $last_updated</p>
+            <p>Automatically updated via GitHub Actions</p>
+        </div>
+    </div>
     
-    def generate_html_report(self) -> str:
-        """Generate complete HTML report for GitHub Pages"""
-        stats = self.get_player_stats()
-        decks = self.get_deck_performance(10)
-        # battles = self.get_recent_battles(15)  # Commented out - Recent Battles section
-        daily_stats = self.get_daily_battle_stats(30)
-        clan_rankings = self.get_clan_rankings_data()
-        clan_members = self.get_clan_members()
-        deck_analytics = self.get_clan_deck_analytics()
-        # card_level_analytics = self.get_card_level_analytics()  # Commented out - Advanced Battle Analytics section
+    <script>
+    // Table sorting functionality
+    document.addEventListener('DOMContentLoaded', function() {
+        var table = document.getElementById('clan-members-table');
+        if (!table) return; // Exit if table doesn't exist
         
-        if not stats:
-            return self.generate_error_page()
+        var headers = table.querySelectorAll('th.sortable');
+        var currentSort = { column: '', direction: '' };
         
-        win_rate = (stats['wins'] / max(stats['total_battles'], 1)) * 100
+        headers.forEach(function(header) {
+            header.addEventListener('click', function() {
+                var column = this.getAttribute('data-column');
+                var direction = currentSort.column === column && currentSort.direction === 'asc' ? 'desc' : 'asc';
+                
+                // Remove existing sort classes
+                headers.forEach(function(h) { h.classList.remove('sort-asc', 'sort-desc'); });
+                
+                // Add sort class to current header
+                this.classList.add('sort-' + direction);
+                
+                // Sort the table
+                sortTable(column, direction);
+                
+                currentSort = { column: column, direction: direction };
+            });
+        });
         
-        # Generate deck performance HTML
-        deck_performance_html = ""
-        for i, deck in enumerate(decks, 1):
-            trophy_color = "green" if deck['total_trophy_change'] >= 0 else "red"
-            deck_cards_html = self.generate_deck_cards_html(deck['deck_cards'], show_names=False)
+        function sortTable(column, direction) {
+            var tbody = table.querySelector('tbody');
+            var rows = Array.from(tbody.querySelectorAll('tr'));
             
-            deck_performance_html += f"""
-                <div class="deck-item">
-                    <div class="deck-header">
-                        <h3>#{i} - {deck['win_rate']}% Win Rate</h3>
-                        <div class="deck-stats">
-                            <span class="stat">🏆 {deck['total_battles']} battles</span>
-                            <span class="stat">✅ {deck['wins']} wins</span>
-                            <span class="stat">❌ {deck['losses']} losses</span>
-                            <span class="stat" style="color: {trophy_color}">📈 {deck['total_trophy_change']:+d} trophies</span>
-                            <span class="stat">👑 {deck['avg_crowns']:.1f} avg crowns</span>
-                        </div>
-                    </div>
-                    {deck_cards_html}
-                </div>
-            """
-        
-        # Generate battle HTML - COMMENTED OUT
-        # battles_table_html = ""
-        # battles_cards_html = ""
-        # 
-        # for battle in battles[:10]:
-        #     result_class = battle['result']
-        #     result_text = battle['result'].upper()
-        #     trophy_color = "green" if battle['trophy_change'] >= 0 else "red"
-        #     
-        #     # Table and card HTML generation
-        #     battles_table_html += f"""
-        #         <tr class="battle-{result_class}">
-        #             <td>{self.format_time_ago(battle['battle_time'])}</td>
-        #             <td><span class="result-{result_class}">{result_text}</span></td>
-        #             <td>{battle['opponent_name']}</td>
-        #             <td>{battle['crowns']}</td>
-        #             <td style="color: {trophy_color}">{battle['trophy_change']:+d}</td>
-        #             <td>{battle['arena_name']}</td>
-        #         </tr>
-        #     """
-        #     
-        #     battles_cards_html += f"""
-        #         <div class="battle-card battle-{result_class}">
-        #             <div class="battle-card-header">
-        #                 <span class="result-{result_class} battle-result">{result_text}</span>
-        #                 <span class="battle-time">{self.format_time_ago(battle['battle_time'])}</span>
-        #             </div>
-        #             <div class="battle-card-content">
-        #                 <div class="battle-info">
-        #                     <strong>vs {battle['opponent_name']}</strong>
-        #                     <span>{battle['arena_name']}</span>
-        #                 </div>
-        #                 <div class="battle-stats">
-        #                     <span class="crown-count">👑 {battle['crowns']}</span>
-        #                     <span class="trophy-change" style="color: {trophy_color}">🏆 {battle['trophy_change']:+d}</span>
-        #                 </div>
-        #             </div>
-        #         </div>
-        #     """
-        
-        # Generate daily histogram for both desktop (30 days) and mobile (7 days)
-        daily_stats_7_days = self.get_daily_battle_stats(7)
-        daily_histogram_desktop = self.generate_daily_histogram_html(daily_stats, "histogram-desktop", include_legend=True)
-        daily_histogram_mobile = self.generate_daily_histogram_html(daily_stats_7_days, "histogram-mobile", include_legend=False)
-        daily_histogram_html = daily_histogram_desktop + daily_histogram_mobile
-        # clan_favorite_cards_html = self.generate_clan_favorite_cards_html(deck_analytics)  # Commented out
-        # card_level_analytics_html = self.generate_card_level_analytics_html(card_level_analytics)  # Commented out
-        clan_member_activity_html = self.generate_clan_member_activity_html(clan_members, deck_analytics, stats['name'])
+            rows.sort(function(a, b) {
+                var aVal, bVal;
+                
+                switch(column) {
+                    case 'name':
+                        aVal = a.cells[0].textContent.trim().toLowerCase();
+                        bVal = b.cells[0].textContent.trim().toLowerCase();
+                        break;
+                    case 'role':
+                        // Custom role order: leader > co-leader > elder > member
+                        var roleOrder = {'leader': 1, 'co-leader': 2, 'elder': 3, 'member': 4};
+                        aVal = roleOrder[a.cells[1].textContent.trim().toLowerCase()] || 5;
+                        bVal = roleOrder[b.cells[1].textContent.trim().toLowerCase()] || 5;
+                        break;
+                    case 'trophies':
+                        aVal = parseInt(a.cells[2].textContent.replace(/,/g, '')) || 0;
+                        bVal = parseInt(b.cells[2].textContent.replace(/,/g, '')) || 0;
+                        break;
+                    case 'donations':
+                        // Extract total donations (sent + received)
+                        var aDonations = a.cells[3].textContent.match(/(\\d+)↑\\s*(\\d+)↓/);
+                        var bDonations = b.cells[3].textContent.match(/(\\d+)↑\\s*(\\d+)↓/);
+                        aVal = aDonations ? parseInt(aDonations[1]) + parseInt(aDonations[2]) : 0;
+                        bVal = bDonations ? parseInt(bDonations[1]) + parseInt(bDonations[2]) : 0;
+                        break;
+                    case 'deck-changes':
+                        aVal = parseInt(a.cells[4].textContent) || 0;
+                        bVal = parseInt(b.cells[4].textContent) || 0;
+                        break;
+                    case 'last-seen':
+                        // Parse relative time strings for sorting
+                        aVal = parseTimeAgo(a.cells[5].textContent.trim());
+                        bVal = parseTimeAgo(b.cells[5].textContent.trim());
+                        break;
+                    default:
+                        aVal = a.cells[0].textContent.trim();
+                        bVal = b.cells[0].textContent.trim();
+                }
+                
+                if (direction === 'asc') {
+                    return aVal < bVal ? -1 : aVal > bVal ? 1 : 0;
+                } else {
+                    return aVal > bVal ? -1 : aVal < bVal ? 1 : 0;
+                }
+            });
+            
+            // Re-append sorted rows
+            rows.forEach(function(row) { tbody.appendChild(row); });
+        }
         
-        return self.generate_full_html(stats, win_rate, deck_performance_html, 
-                                     daily_histogram_html, clan_member_activity_html)
+        function parseTimeAgo(timeStr) {
+            // Convert time ago strings to minutes for sorting
+            if (timeStr === 'never') return 999999;
+            if (timeStr.includes('hours ago')) {
+                return parseInt(timeStr) * 60;
+            } else if (timeStr.includes('days ago')) {
+                return parseInt(timeStr) * 24 * 60;
+            } else if (timeStr.includes('minutes ago')) {
+                return parseInt(timeStr);
+            } else if (timeStr.includes('hour ago')) {
+                return 60;
+            } else if (timeStr.includes('day ago')) {
+                return 24 * 60;
+            } else if (timeStr.includes('minute ago')) {
+                return 1;
+            }
+            return 0; // "just now" or unrecognized format
+        }
+    });
+    </script>
+</body>
+</html>
+""")
+
+def _split_template(tmpl: Template) -> tuple:
+    """Pre-split a template into its static text runs and placeholder names.
     
-    def generate_error_page(self) -> str:
-        """Generate error page when no data is available"""
-        return """
+    Returns (literals, names) with len(literals) == len(names) + 1, so a render is
+    literals[0], value(names[0]), literals[1], ... and the static text is never re-scanned.
+    """
+    literals, names = [], []
+    text, pos = [], 0
+    for match in tmpl.pattern.finditer(tmpl.template):
+        text.append(tmpl.template[pos:match.start()])
+        pos = match.end()
+        name = match.group('named') or match.group('braced')
+        if name is None:
+            text.append('$')  # "$$" escape
+            continue
+        literals.append(''.join(text))
+        names.append(name)
+        text = []
+    text.append(tmpl.template[pos:])
+    literals.append(''.join(text))
+    return tuple(literals), tuple(names)
+
+_REPORT_LITERALS, _REPORT_NAMES = _split_template(_REPORT_TMPL)
+
+# Static page written when the database has no player data yet
+_ERROR_PAGE_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -1192,10 +521,167 @@ class GitHubPagesHTMLGenerator:
 </body>
 </html>
         """
-    
-    def get_base_css_styles(self) -> str:
-        """Get base CSS styles used across all pages"""
-        return """
+
+# Caching policy for hosts that read a Netlify/Cloudflare Pages style _headers
+# file (GitHub Pages ignores it): hashed stylesheets never change under their
+# name, pages are regenerated hourly
+_HEADERS_FILE = """/styles.*.css
+  Cache-Control: public, max-age=31536000, immutable
+/*.html
+  Cache-Control: public, max-age=300, stale-while-revalidate=86400
+/
+  Cache-Control: public, max-age=300, stale-while-revalidate=86400
+"""
+
+# Stylesheet generations kept in docs: the current one plus the previous one, which
+# pages cached under stale-while-revalidate may still link to; ordered in the manifest
+_KEPT_STYLESHEETS = 2
+_STYLESHEET_MANIFEST = '.stylesheets'
+
+def _is_stylesheet(filename: str) -> bool:
+    """True for the hashed base stylesheets, styles.<hash>.css"""
+    return filename.startswith('styles.') and filename.endswith('.css')
+
+# Each member's most recent clan_member_decks row; a GROUP BY over the
+# (player_tag, id) index instead of a correlated MAX(id) per row
+_LATEST_DECKS_CTE = """
+    WITH latest AS (
+        SELECT cmd.player_tag, cmd.name, cmd.deck_cards, cmd.favorite_card
+        FROM clan_member_decks cmd
+        JOIN (
+            SELECT player_tag, MAX(id) AS max_id
+            FROM clan_member_decks
+            GROUP BY player_tag
+        ) m ON cmd.id = m.max_id
+    )
+"""
+
+def _json_default(value):
+    """json.dumps fallback for report inputs: sqlite3.Row as a dict, anything else as str"""
+    if isinstance(value, sqlite3.Row):
+        return dict(value)
+    return str(value)
+
+@lru_cache(maxsize=512)
+def _parse_ts(timestamp: str) -> datetime:
+    """Parse a stored timestamp (API '...Z' form or local isoformat); raises ValueError/TypeError"""
+    return datetime.fromisoformat(timestamp)  # 3.11+ accepts the compact 'Z' form directly
+
+# Elapsed-seconds cutoffs for _format_time_ago and the (divisor, label) each band uses
+_TIME_AGO_THRESHOLDS = (61, 3601, 86400)
+_TIME_AGO_UNITS = ((1, "just now"), (60, "{} minutes ago"), (3600, "{} hours ago"), (86400, "{} days ago"))
+
+@lru_cache(maxsize=1024)
+def _format_time_ago(timestamp: str, now: datetime) -> str:
+    """Format timestamp as time ago relative to now"""
+    if not timestamp or timestamp == 'never':
+        return "never"
+        
+    try:
+        dt = _parse_ts(timestamp)
+    except (ValueError, TypeError):
+        return "unknown"
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+        
+    elapsed = int((now - dt).total_seconds())
+    divisor, label = _TIME_AGO_UNITS[bisect_right(_TIME_AGO_THRESHOLDS, elapsed)]
+    return label.format(elapsed // divisor)
+
+# Long date used for report and timeline dates, e.g. 'March 05, 2025'
+_DATE_FORMAT = '%B %d, %Y'
+
+@lru_cache(maxsize=1024)
+def _format_date(timestamp: str) -> str:
+    """Format timestamp as readable date"""
+    if not timestamp:
+        return "unknown"
+        
+    try:
+        return _parse_ts(timestamp).strftime(_DATE_FORMAT)
+    except (ValueError, TypeError):
+        return "unknown"
+
+# Card name -> image filename (GitHub Pages uses relative paths); read-only, built once at import
+_CARD_NAME_MAPPING = MappingProxyType({
+    'Three Musketeers': '3M',
+    'Archer Queen': 'ArcherQueen',
+    'Baby Dragon': 'BabyD',
+    'Barbarian Barrel': 'BarbBarrel',
+    'Barbarians': 'Barbs',
+    'Battle Healer': 'BattleHealer',
+    'Goblin Barrel': 'Barrel',
+    'Bomb Tower': 'BombTower',
+    'Boss Bandit': 'BossBandit',
+    'Cannon Cart': 'CannonCart',
+    'Dark Prince': 'DarkPrince',
+    'Dart Goblin': 'DartGob',
+    'Electro Giant': 'ElectroGiant',
+    'Electro Spirit': 'ElectroSpirit',
+    'Elixir Golem': 'ElixirGolem',
+    'Executioner': 'Exe',
+    'Fire Spirit': 'FireSpirit',
+    'Flying Machine': 'FlyingMachine',
+    'Goblin Gang': 'GobGang',
+    'Goblin Giant': 'GobGiant',
+    'Goblin Hut': 'GobHut',
+    'Goblin Cage': 'GoblinCage',
+    'Goblin Curse': 'GoblinCurse',
+    'Goblin Demolisher': 'GoblinDemolisher',
+    'Goblin Drill': 'GoblinDrill',
+    'Goblin Machine': 'GoblinMachine',
+    'Goblins': 'Gobs',
+    'Golden Knight': 'GoldenKnight',
+    'Giant Skeleton': 'GiantSkelly',
+    'Heal Spirit': 'HealSpirit',
+    'Hog Rider': 'Hog',
+    'Minion Horde': 'Horde',
+    'Ice Golem': 'IceGolem',
+    'Ice Spirit': 'IceSpirit',
+    'Ice Wizard': 'IceWiz',
+    'Inferno Tower': 'Inferno',
+    'Inferno Dragon': 'InfernoD',
+    'Lava Hound': 'Lava',
+    'Little Prince': 'LittlePrince',
+    'The Log': 'Log',
+    'Lumberjack': 'Lumber',
+    'Mega Minion': 'MM',
+    'Mini P.E.K.K.A': 'MP',
+    'Magic Archer': 'MagicArcher',
+    'Mega Knight': 'MegaKnight',
+    'Mighty Miner': 'MightyMiner',
+    'Mother Witch': 'MotherWitch',
+    'Musketeer': 'Musk',
+    'Night Witch': 'NightWitch',
+    'P.E.K.K.A': 'PEKKA',
+    'Elixir Collector': 'Pump',
+    'Royal Giant': 'RG',
+    'Battle Ram': 'Ram',
+    'Ram Rider': 'RamRider',
+    'Royal Delivery': 'RoyalDelivery',
+    'Royal Hogs': 'RoyalHogs',
+    'Royal Recruits': 'RoyalRecruits',
+    'Skeleton Army': 'Skarmy',
+    'Skeleton Dragons': 'SkeletonDragons',
+    'Skeleton King': 'SkeletonKing',
+    'Skeletons': 'Skellies',
+    'Skeleton Barrel': 'SkellyBarrel',
+    'Giant Snowball': 'Snowball',
+    'Spear Goblins': 'SpearGobs',
+    'Spirit Empress': 'SpiritEmpress',
+    'Suspicious Bush': 'SuspiciousBush',
+    'Valkyrie': 'Valk',
+    'Wall Breakers': 'WallBreakers',
+    'Wizard': 'Wiz',
+    'X-Bow': 'XBow',
+    'Elite Barbarians': 'eBarbs',
+    'Electro Dragon': 'eDragon',
+    'Electro Wizard': 'eWiz'
+})
+
+class GitHubPagesHTMLGenerator:
+    # Base stylesheet shared by every page, defined once at class creation
+    BASE_CSS = _compile_css("""
         * {
             margin: 0;
             padding: 0;
@@ -1207,6 +693,7 @@ class GitHubPagesHTMLGenerator:
             src: url('assets/fonts/Clash_Regular.otf') format('opentype');
             font-weight: normal;
             font-style: normal;
+            font-display: swap;
         }
         
         @font-face {
@@ -1214,6 +701,7 @@ class GitHubPagesHTMLGenerator:
             src: url('assets/fonts/Supercell-Magic Regular.ttf') format('truetype');
             font-weight: normal;
             font-style: normal;
+            font-display: swap;
         }
         
         body {
@@ -1224,7 +712,7 @@ class GitHubPagesHTMLGenerator:
         }
         
         h1, h2, h3, h4, h5, h6 {
-            font-family: 'Clash-Regular', 'Supercell-Magic', sans-serif;
+            font-family: 'Clash-Regular', 'Supercell-Magic', 'Apple Color Emoji', 'Segoe UI Emoji', 'Noto Color Emoji', sans-serif;
         }
         
         .container {
@@ -1266,14 +754,14 @@ class GitHubPagesHTMLGenerator:
         }
         
         .stat-card h3 {
-            color: #2d3748;
+            color: $text;
             margin-bottom: 10px;
         }
         
         .stat-card .value {
             font-size: 1.8em;
             font-weight: bold;
-            color: #4299e1;
+            color: $accent;
         }
         
         .section {
@@ -1287,9 +775,9 @@ class GitHubPagesHTMLGenerator:
         }
         
         .section h2 {
-            color: #2d3748;
+            color: $text;
             margin-bottom: 25px;
-            border-bottom: 3px solid #4299e1;
+            border-bottom: 3px solid $accent;
             padding-bottom: 10px;
         }
         
@@ -1306,7 +794,7 @@ class GitHubPagesHTMLGenerator:
         }
         
         .deck-header h3 {
-            color: #2d3748;
+            color: $text;
             margin-bottom: 8px;
         }
         
@@ -1351,10 +839,10 @@ class GitHubPagesHTMLGenerator:
         
         .card-container {
             text-align: center;
-            background: rgba(255, 255, 255, 0.9);
+            background: $card_bg;
             border-radius: 8px;
             padding: 10px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
+            box-shadow: $shadow;
         }
         
         .card-image {
@@ -1374,7 +862,7 @@ class GitHubPagesHTMLGenerator:
         table {
             width: 100%;
             border-collapse: collapse;
-            background: rgba(255, 255, 255, 0.9);
+            background: $card_bg;
             border-radius: 8px;
             overflow: hidden;
         }
@@ -1386,38 +874,11 @@ class GitHubPagesHTMLGenerator:
         }
         
         th {
-            background: #4299e1;
+            background: $accent;
             color: white;
             font-weight: 600;
         }
         
-        .battle-victory {
-            background-color: rgba(72, 187, 120, 0.1);
-        }
-        
-        .battle-defeat {
-            background-color: rgba(245, 101, 101, 0.1);
-        }
-        
-        .battle-draw {
-            background-color: rgba(237, 137, 54, 0.1);
-        }
-        
-        .result-victory {
-            color: #38a169;
-            font-weight: bold;
-        }
-        
-        .result-defeat {
-            color: #e53e3e;
-            font-weight: bold;
-        }
-        
-        .result-draw {
-            color: #ed8936;
-            font-weight: bold;
-        }
-        
         .current-player {
             background-color: rgba(66, 153, 225, 0.2);
             font-weight: bold;
@@ -1439,117 +900,51 @@ class GitHubPagesHTMLGenerator:
         }
         
         .role-member {
-            color: #718096;
+            color: $muted;
         }
         
-        /* Mobile Battle Cards */
-        .battle-cards {
+        /* Mobile Clan Member Cards */
+        .clan-member-cards {
             display: none;
         }
         
-        .battle-card {
-            background: rgba(255, 255, 255, 0.9);
+        .clan-member-card {
+            background: $card_bg;
             border-radius: 10px;
             padding: 15px;
             margin-bottom: 15px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
+            box-shadow: $shadow;
             border-left: 4px solid #e2e8f0;
         }
         
-        .battle-card.battle-victory {
-            border-left-color: #38a169;
-            background-color: rgba(72, 187, 120, 0.05);
-        }
-        
-        .battle-card.battle-defeat {
-            border-left-color: #e53e3e;
-            background-color: rgba(245, 101, 101, 0.05);
-        }
-        
-        .battle-card.battle-draw {
-            border-left-color: #ed8936;
-            background-color: rgba(237, 137, 54, 0.05);
-        }
-        
-        .battle-card-header {
+        .member-card-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 10px;
         }
         
-        .battle-result {
-            font-size: 1.1em;
-            font-weight: bold;
-            padding: 5px 10px;
-            border-radius: 5px;
-            background: rgba(255, 255, 255, 0.8);
-        }
-        
-        .battle-time {
-            color: #718096;
-            font-size: 0.9em;
-        }
-        
-        .battle-card-content {
+        .member-card-content {
             display: flex;
             justify-content: space-between;
             align-items: center;
         }
         
-        .battle-info {
-            display: flex;
-            flex-direction: column;
-        }
-        
-        .battle-info span {
-            color: #718096;
-            font-size: 0.9em;
-        }
-        
-        .battle-stats {
-            display: flex;
-            flex-direction: column;
-            align-items: flex-end;
-            gap: 5px;
-        }
-        
-        .crown-count, .trophy-change {
+        .trophy-count, .donation-stats {
             padding: 3px 8px;
             border-radius: 5px;
             background: rgba(255, 255, 255, 0.8);
             font-size: 0.9em;
         }
         
-        /* Mobile Clan Member Cards */
-        .clan-member-cards {
-            display: none;
-        }
-        
-        .clan-member-card {
-            background: rgba(255, 255, 255, 0.9);
-            border-radius: 10px;
-            padding: 15px;
-            margin-bottom: 15px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-            border-left: 4px solid #e2e8f0;
-        }
-        
         .current-player-card {
-            border-left-color: #4299e1;
+            border-left-color: $accent;
             background: rgba(66, 153, 225, 0.1);
         }
         
-        .member-card-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 10px;
-        }
-        
         .member-name {
             font-size: 1.1em;
-            color: #2d3748;
+            color: $text;
         }
         
         .member-role {
@@ -1560,31 +955,18 @@ class GitHubPagesHTMLGenerator:
             font-weight: bold;
         }
         
-        .member-card-content {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-        }
-        
         .member-stats {
             display: flex;
             flex-direction: column;
             gap: 5px;
         }
         
-        .trophy-count, .donation-stats {
-            padding: 3px 8px;
-            border-radius: 5px;
-            background: rgba(255, 255, 255, 0.8);
-            font-size: 0.9em;
-        }
-        
         .member-activity {
             text-align: right;
         }
         
         .last-seen {
-            color: #718096;
+            color: $muted;
             font-size: 0.9em;
             padding: 3px 8px;
             border-radius: 5px;
@@ -1600,843 +982,1610 @@ class GitHubPagesHTMLGenerator:
         
         /* Custom Stacked Histogram Styles */
         .chart-container {
-            background: rgba(255, 255, 255, 0.9);
+            background: $card_bg;
             border-radius: 10px;
             padding: 20px;
             margin: 20px 0;
             box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
         }
         
-        .stacked-histogram {
-            display: flex;
-            align-items: flex-end;
-            justify-content: space-between;
-            height: 200px;
-            padding: 20px 10px 30px 10px;
-            position: relative;
+        .stacked-histogram {
+            display: flex;
+            align-items: flex-end;
+            justify-content: space-between;
+            height: 200px;
+            padding: 20px 10px 30px 10px;
+            position: relative;
+        }
+        
+        .histogram-bar {
+            flex: 1;
+            max-width: 25px;
+            margin: 0 2px;
+            position: relative;
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            cursor: pointer;
+        }
+        
+        .bar-date {
+            position: absolute;
+            bottom: -25px;
+            left: 50%;
+            transform: translateX(-50%);
+            font-size: 0.8em;
+            color: #4a5568;
+            font-weight: 500;
+        }
+        
+        .bar-stack {
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+            width: 100%;
+        }
+        
+        .bar-segment {
+            width: 100%;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            border-radius: 2px;
+            position: relative;
+            font-size: 0.75em;
+            font-weight: bold;
+            color: white;
+            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.3);
+        }
+        
+        .segment-value {
+            opacity: 0.9;
+        }
+        
+        /* Result gradients, shared by the histogram bars and their legend swatches */
+        .bar-wins, .legend-wins {
+            background: linear-gradient(180deg, #48bb78, #38a169);
+        }
+        
+        .bar-losses, .legend-losses {
+            background: linear-gradient(180deg, #f56565, #e53e3e);
+        }
+        
+        .bar-draws {
+            background: linear-gradient(180deg, #ed8936, #dd6b20);
+        }
+        
+        .bar-empty {
+            background: linear-gradient(180deg, #cbd5e0, #a0aec0);
+            border: 1px dashed $muted;
+        }
+        
+        .bar-wins {
+            border-radius: 2px 2px 0 0;
+        }
+        
+        .bar-empty {
+            border-radius: 2px;
+        }
+        
+        .histogram-legend {
+            display: flex;
+            justify-content: center;
+            gap: 20px;
+            margin-top: 15px;
+            flex-wrap: wrap;
+        }
+        
+        .legend-item {
+            display: flex;
+            align-items: center;
+            gap: 8px;
+            font-size: 0.9em;
+            color: #4a5568;
+        }
+        
+        .legend-color {
+            width: 16px;
+            height: 16px;
+            border-radius: 3px;
+        }
+        
+        /* Clan Rankings Styles */
+        .clan-rankings, .opponent-clans-list {
+            display: flex;
+            flex-direction: column;
+            gap: 12px;
+        }
+        
+        .ranking-item {
+            display: flex;
+            align-items: center;
+            background: $card_bg;
+            border-radius: 10px;
+            padding: 15px;
+            box-shadow: $shadow;
+            transition: transform 0.2s ease;
+        }
+        
+        .ranking-item:hover {
+            transform: translateY(-2px);
+        }
+        
+        .current-player-ranking {
+            background: rgba(66, 153, 225, 0.15);
+            border-left: 4px solid $accent;
+            font-weight: bold;
+        }
+        
+        .ranking-position {
+            font-size: 1.5em;
+            font-weight: bold;
+            color: $accent;
+            min-width: 50px;
+            text-align: center;
+        }
+        
+        .ranking-info {
+            flex: 1;
+            margin-left: 20px;
+        }
+        
+        .ranking-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 8px;
+        }
+        
+        .ranking-stats {
+            display: flex;
+            gap: 20px;
+            align-items: center;
+            flex-wrap: wrap;
+        }
+        
+        .stat-group {
+            display: flex;
+            align-items: center;
+            gap: 8px;
+        }
+        
+        .trophy-up, .trophy-down, .donation-up, .donation-down {
+            font-weight: bold;
+            font-size: 0.9em;
+        }
+        
+        .trophy-up {
+            color: #38a169;
+        }
+        
+        .trophy-down, .donation-down {
+            color: #e53e3e;
+        }
+        
+        .donation-up {
+            color: #3182ce;
         }
         
-        .histogram-bar {
-            flex: 1;
-            max-width: 25px;
-            margin: 0 2px;
-            position: relative;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            cursor: pointer;
+        .trophy-neutral, .donation-neutral, .last-seen-info {
+            color: $muted;
+            font-size: 0.9em;
         }
         
-        .bar-date {
-            position: absolute;
-            bottom: -25px;
-            left: 50%;
-            transform: translateX(-50%);
-            font-size: 0.8em;
-            color: #4a5568;
-            font-weight: 500;
+        /* Clan Deck Analytics Styles */
+        .analytics-section {
+            margin-bottom: 30px;
         }
         
-        .bar-stack {
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            width: 100%;
+        .analytics-section h3 {
+            color: $text;
+            margin-bottom: 15px;
+            font-size: 1.2em;
         }
         
-        .bar-segment {
-            width: 100%;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            border-radius: 2px;
-            position: relative;
-            font-size: 0.75em;
+        .usage-count {
             font-weight: bold;
-            color: white;
-            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.3);
+            color: $text;
         }
         
-        .segment-value {
-            opacity: 0.9;
+        .favorite-cards-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
+            gap: 15px;
         }
         
-        .bar-wins {
-            background: linear-gradient(180deg, #48bb78, #38a169);
-            border-radius: 2px 2px 0 0;
+        .favorite-card-item {
+            background: $card_bg;
+            border-radius: 10px;
+            padding: 10px;
+            text-align: center;
+            box-shadow: $shadow;
         }
         
-        .bar-losses {
-            background: linear-gradient(180deg, #f56565, #e53e3e);
+        .favorite-card-image {
+            width: 50px;
+            height: 60px;
+            object-fit: contain;
+            margin-bottom: 8px;
         }
         
-        .bar-draws {
-            background: linear-gradient(180deg, #ed8936, #dd6b20);
+        .favorite-card-info .card-name {
+            display: block;
+            font-weight: 500;
+            color: $text;
+            font-size: 0.9em;
         }
         
-        .bar-empty {
-            background: linear-gradient(180deg, #cbd5e0, #a0aec0);
-            border: 1px dashed #718096;
-            border-radius: 2px;
+        .favorite-card-info .usage-count {
+            color: $accent;
+            font-size: 0.8em;
         }
         
-        .histogram-legend {
-            display: flex;
-            justify-content: center;
+        /* Card Level Analytics Styles */
+        .level-comparison {
+            display: grid;
+            grid-template-columns: repeat(2, 1fr);
             gap: 20px;
-            margin-top: 15px;
-            flex-wrap: wrap;
+            margin-bottom: 20px;
         }
         
-        .legend-item {
+        .level-stat, .win-stat, .opponent-clan-item {
             display: flex;
+            justify-content: space-between;
             align-items: center;
-            gap: 8px;
-            font-size: 0.9em;
-            color: #4a5568;
+            background: $card_bg;
+            border-radius: 8px;
+            padding: 15px;
+            box-shadow: $shadow;
         }
         
-        .legend-color {
-            width: 16px;
-            height: 16px;
-            border-radius: 3px;
+        .level-label {
+            font-weight: 500;
+            color: $text;
         }
         
-        .legend-wins {
-            background: linear-gradient(180deg, #48bb78, #38a169);
+        .level-value {
+            font-size: 1.5em;
+            font-weight: bold;
+            color: $accent;
         }
         
-        .legend-losses {
-            background: linear-gradient(180deg, #f56565, #e53e3e);
+        .level-win-stats {
+            display: grid;
+            grid-template-columns: repeat(2, 1fr);
+            gap: 15px;
+            margin-bottom: 20px;
         }
         
-        .legend-draws {
-            background: linear-gradient(180deg, #ed8936, #dd6b20);
+        .win-stat {
+            background: rgba(255, 255, 255, 0.8);
+            padding: 12px;
+            box-shadow: $shadow_sm;
         }
         
-        .legend-empty {
-            background: linear-gradient(180deg, #cbd5e0, #a0aec0);
-            border: 1px dashed #718096;
+        .win-label {
+            font-size: 0.9em;
+            color: #4a5568;
         }
         
-        /* Clan Rankings Styles */
-        .clan-rankings {
-            display: flex;
-            flex-direction: column;
-            gap: 12px;
+        .win-count {
+            font-weight: bold;
+            color: #38a169;
         }
         
-        .ranking-item {
+        .clan-name {
+            font-weight: 500;
+            color: $text;
+            font-size: 1.1em;
+        }
+        
+        .clan-stats {
             display: flex;
-            align-items: center;
-            background: rgba(255, 255, 255, 0.9);
-            border-radius: 10px;
-            padding: 15px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-            transition: transform 0.2s ease;
+            flex-direction: column;
+            align-items: flex-end;
+            gap: 4px;
         }
         
-        .ranking-item:hover {
-            transform: translateY(-2px);
+        .battles-count {
+            font-size: 0.9em;
+            color: $muted;
         }
         
-        .current-player-ranking {
-            background: rgba(66, 153, 225, 0.15);
-            border-left: 4px solid #4299e1;
+        .win-rate {
             font-weight: bold;
+            font-size: 0.9em;
         }
         
-        .ranking-position {
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #4299e1;
-            min-width: 50px;
-            text-align: center;
+        @media (max-width: 768px) {
+            .deck-cards {
+                grid-template-columns: repeat(2, 1fr);
+            }
+            
+            .deck-cards-compact {
+                gap: 6px;
+            }
+            
+            .deck-cards-compact .card-container {
+                padding: 3px;
+                min-width: 40px;
+            }
+            
+            .deck-cards-compact .card-image {
+                width: 40px;
+                height: 48px;
+            }
+            
+            .player-stats {
+                grid-template-columns: 1fr;
+            }
+            
+            .deck-stats {
+                flex-direction: column;
+            }
+            
+            /* Hide tables on mobile, show cards */
+            .desktop-table {
+                display: none;
+            }
+            
+            .clan-member-cards {
+                display: block;
+            }
+            
+            .container {
+                padding: 10px;
+            }
+            
+            .section {
+                padding: 20px;
+            }
+            
+            .header {
+                padding: 20px;
+            }
+            
+            .chart-container {
+                padding: 15px;
+            }
+            
+            .stacked-histogram {
+                height: 150px;
+                padding: 15px 5px 25px 5px;
+            }
+            
+            .histogram-bar {
+                max-width: 15px;
+                margin: 0 1px;
+            }
+            
+            .bar-date {
+                font-size: 0.7em;
+                bottom: -20px;
+            }
+            
+            .bar-segment {
+                font-size: 0.65em;
+            }
+            
+            .histogram-legend {
+                gap: 15px;
+            }
+            
+            .ranking-stats {
+                flex-direction: column;
+                align-items: flex-start;
+                gap: 8px;
+            }
+            
+            .ranking-header {
+                flex-direction: column;
+                align-items: flex-start;
+                gap: 5px;
+            }
+            
+            .level-comparison, .level-win-stats {
+                grid-template-columns: 1fr;
+            }
         }
         
-        .ranking-info {
-            flex: 1;
-            margin-left: 20px;
+        @media (min-width: 769px) {
+            .desktop-table {
+                display: block;
+            }
+            
+            .clan-member-cards {
+                display: none;
+            }
         }
         
-        .ranking-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 8px;
+        /* Sortable table styles */
+        .sortable {
+            cursor: pointer;
+            user-select: none;
+            position: relative;
+            transition: background-color 0.2s ease;
         }
         
-        .ranking-stats {
-            display: flex;
-            gap: 20px;
-            align-items: center;
-            flex-wrap: wrap;
+        .sortable:hover {
+            background-color: #3182ce !important;
         }
         
-        .stat-group {
-            display: flex;
-            align-items: center;
-            gap: 8px;
+        .sort-indicator {
+            font-size: 0.8em;
+            margin-left: 5px;
+            opacity: 0.6;
         }
         
-        .trophy-up {
+        .sortable.sort-asc .sort-indicator:after {
+            content: " ↑";
             color: #38a169;
             font-weight: bold;
-            font-size: 0.9em;
         }
         
-        .trophy-down {
+        .sortable.sort-desc .sort-indicator:after {
+            content: " ↓";
             color: #e53e3e;
             font-weight: bold;
-            font-size: 0.9em;
         }
         
-        .trophy-neutral {
-            color: #718096;
-            font-size: 0.9em;
+        /* Responsive histogram styles */
+        .histogram-desktop {
+            display: block;
         }
         
-        .donation-up {
-            color: #3182ce;
-            font-weight: bold;
-            font-size: 0.9em;
+        .histogram-mobile {
+            display: none;
         }
         
-        .donation-down {
-            color: #e53e3e;
-            font-weight: bold;
-            font-size: 0.9em;
+        @media (max-width: 768px) {
+            .histogram-desktop {
+                display: none;
+            }
+            
+            .histogram-mobile {
+                display: block;
+            }
+            
+            .histogram-mobile .stacked-histogram {
+                height: 180px;
+                padding: 20px 5px 30px 5px;
+            }
+            
+            .histogram-mobile .histogram-bar {
+                max-width: 20px;
+                margin: 0 2px;
+            }
         }
+        """)
+    # Served as a separate, content-addressed file so browsers cache it across pages and runs
+    STYLESHEET = f"styles.{hashlib.md5(BASE_CSS.encode('utf-8')).hexdigest()[:8]}.css"
+    # Header/stat-card rules inlined in index.html so first paint doesn't wait for STYLESHEET
+    CRITICAL_CSS = _critical_css(_minify_css(BASE_CSS))
+    
+    def __init__(self, db_path: str = "clash_royale.db"):
+        self.db_path = db_path
+        # Footer timestamp, formatted once per run and shared by every page this generator writes
+        self.generated_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        # Reference time for "... ago" labels, taken once so every row on every page agrees
+        self._now = datetime.now(timezone.utc)
+        # Card filename -> image path, filled from one directory scan on first use
+        self._image_path_cache = None
+        # Card name -> resolved image path (or placeholder URL), filled as cards are rendered
+        self._card_path_cache = {}
+        # Card name -> rendered card container, one dict per show_names value (False, True)
+        self._card_html_cache = ({}, {})
+        # (deck_cards, show_names) -> rendered deck fragment; decks repeat across member pages
+        self._deck_html_cache = {}
+        # Shared read connection, opened by _get_conn() on first query
+        self._conn = None
+        # Whether battles has the enhanced card-level columns; probed once per generator
+        self._has_card_levels = None
+        # Whether the database file exists; checked once instead of by every getter
+        self._db_exists = None
+    
+    def get_card_filename(self, card_name: str) -> str:
+        """Convert card name to filename"""
+        return _CARD_NAME_MAPPING.get(card_name) or card_name.translate(_FILENAME_STRIP)
+    
+    def safe_filename(self, name: str) -> str:
+        """Convert member name to safe filename"""
+        # Remove special characters and spaces
+        return _WS_RE.sub('_', _UNSAFE_RE.sub('', name)).lower()
+    
+    def get_card_image_path(self, card_name: str) -> str:
+        """Get the relative path to card image for GitHub Pages"""
+        path = self._card_path_cache.get(card_name)
+        if path is None:
+            path = self._card_path_cache[card_name] = self._resolve_card_image_path(card_name)
+        return path
+    
+    def _resolve_card_image_path(self, card_name: str) -> str:
+        """Map a card name to its image path, falling back to a placeholder image"""
+        if self._image_path_cache is None:
+            self._image_path_cache = self._scan_card_images()
+        
+        path = self._image_path_cache.get(self.get_card_filename(card_name))
+        if path:
+            return path
+        # Fallback to placeholder
+        return f"https://via.placeholder.com/100x120/7B68EE/FFFFFF?text={card_name.replace(' ', '+')}"
+    
+    def _scan_card_images(self) -> Dict[str, str]:
+        """List the card image directories once: card filename -> relative path, normal cards first"""
+        # Look in parent directory when running from src/
+        cards_base = "../cards" if os.path.exists("../cards") else "cards"
         
-        .donation-neutral {
-            color: #718096;
-            font-size: 0.9em;
-        }
+        paths = {}
+        for folder in ('evolution_cards', 'normal_cards'):  # normal_cards scanned last so it wins
+            try:
+                with os.scandir(f"{cards_base}/{folder}") as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.png'):
+                            paths[entry.name[:-4]] = f"cards/{folder}/{entry.name}"
+            except FileNotFoundError:
+                continue
+        return paths
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the generator's SQLite connection, opening it on first use"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute("PRAGMA cache_size = -20000")  # ~20 MB page cache
+            self._conn.execute("PRAGMA temp_store = MEMORY")
+            self._conn.execute("PRAGMA mmap_size = 268435456")
+        return self._conn
+    
+    def has_database(self) -> bool:
+        """Whether db_path exists (stat'ed once; connecting would otherwise create an empty file)"""
+        if self._db_exists is None:
+            self._db_exists = os.path.exists(self.db_path)
+        return self._db_exists
+    
+    @contextmanager
+    def read_snapshot(self):
+        """Run a batch of getters inside one read transaction: one BEGIN/COMMIT and a consistent snapshot"""
+        if not self.has_database():
+            yield
+            return
+        conn = self._get_conn()
+        conn.execute("BEGIN")
+        try:
+            yield
+        finally:
+            conn.commit()
+    
+    def close(self):
+        """Close the shared SQLite connection if it was opened"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def get_player_stats(self) -> Optional[Dict]:
+        """Get player statistics from database"""
+        if not self.has_database():
+            return None
+            
+        cursor = self._get_conn().cursor()
         
-        .last-seen-info {
-            color: #718096;
-            font-size: 0.9em;
-        }
+        # Get player info
+        cursor.execute("""
+            SELECT player_tag, name, trophies, best_trophies, level,
+                   clan_tag, clan_name, last_updated
+            FROM players ORDER BY last_updated DESC LIMIT 1
+        """)
+        player_row = cursor.fetchone()
         
-        /* Clan Deck Analytics Styles */
-        .analytics-section {
-            margin-bottom: 30px;
-        }
+        if not player_row:
+            return None
+            
+        # Get battle stats
+        cursor.execute("""
+            SELECT 
+                COUNT(*) as total_battles,
+                SUM(CASE WHEN result = 'victory' THEN 1 ELSE 0 END) as wins,
+                SUM(CASE WHEN result = 'defeat' THEN 1 ELSE 0 END) as losses,
+                SUM(CASE WHEN result = 'draw' THEN 1 ELSE 0 END) as draws,
+                SUM(COALESCE(trophy_change, 0)) as total_trophy_change,
+                MAX(battle_time) as last_battle,
+                MIN(battle_time) as first_battle
+            FROM battles
+        """)
+        battle_stats = cursor.fetchone()
         
-        .analytics-section h3 {
-            color: #2d3748;
-            margin-bottom: 15px;
-            font-size: 1.2em;
+        return {
+            'player_tag': player_row[0],
+            'name': player_row[1],
+            'trophies': player_row[2],
+            'best_trophies': player_row[3],
+            'level': player_row[4],
+            'clan_tag': player_row[5],
+            'clan_name': player_row[6],
+            'last_updated': player_row[7],
+            'total_battles': battle_stats[0] or 0,
+            'wins': battle_stats[1] or 0,
+            'losses': battle_stats[2] or 0,
+            'draws': battle_stats[3] or 0,
+            'total_trophy_change': battle_stats[4] or 0,
+            'last_battle': battle_stats[5],
+            'first_battle': battle_stats[6]
         }
+    
+    def get_deck_performance(self, limit: int = 10) -> List[Dict]:
+        """Get deck performance data"""
+        if not self.has_database():
+            return []
+            
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = sqlite3.Row
         
-        .popular-deck-item {
-            background: rgba(255, 255, 255, 0.9);
-            border-radius: 10px;
-            padding: 15px;
-            margin-bottom: 15px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-        }
+        cursor.execute("""
+            SELECT deck_cards, total_battles, wins, losses, win_rate,
+                   total_trophy_change, avg_crowns,
+                   CASE WHEN total_trophy_change >= 0 THEN 'green' ELSE 'red' END AS trophy_color
+            FROM deck_performance
+            WHERE total_battles >= 3
+            ORDER BY win_rate DESC, total_battles DESC
+            LIMIT ?
+        """, (limit,))
         
-        .deck-popularity {
-            display: flex;
-            align-items: center;
-            margin-bottom: 10px;
-        }
+        results = cursor.fetchall()
         
-        .deck-rank {
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #4299e1;
-            min-width: 40px;
-        }
+        return results
+    
+    def get_card_level_analytics(self) -> Dict:
+        """Get card level analytics from enhanced battle data"""
+        if not self.has_database():
+            return {}
+            
+        cursor = self._get_conn().cursor()
         
-        .deck-info {
-            margin-left: 15px;
-        }
+        # Check if new columns exist (schema doesn't change within a run)
+        if self._has_card_levels is None:
+            cursor.execute("PRAGMA table_info(battles)")
+            self._has_card_levels = any(col[1] == 'deck_card_levels' for col in cursor)
+        if not self._has_card_levels:
+            return {'message': 'Enhanced battle data not available yet. Will be collected from next battles.'}
         
-        .usage-count {
-            font-weight: bold;
-            color: #2d3748;
-        }
+        analytics = {}
         
-        .users-list {
-            color: #718096;
-            font-size: 0.9em;
-            display: block;
-        }
+        # Level comparison over the last 50 battles with level data
+        cursor.execute("""
+            SELECT COUNT(*), SUM(player_level), SUM(opponent_level),
+                   SUM(CASE WHEN result = 'victory' AND player_level > opponent_level THEN 1 ELSE 0 END),
+                   SUM(CASE WHEN result = 'victory' AND player_level < opponent_level THEN 1 ELSE 0 END)
+            FROM (
+                SELECT player_level, opponent_level, result
+                FROM battles 
+                WHERE deck_card_levels IS NOT NULL 
+                ORDER BY battle_time DESC 
+                LIMIT 50
+            )
+            WHERE player_level AND opponent_level
+        """)
         
-        .favorite-cards-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(120px, 1fr));
-            gap: 15px;
-        }
+        total_with_levels, total_player_level, total_opponent_level, level_advantage_wins, level_disadvantage_wins = cursor.fetchone()
+        if total_with_levels > 0:
+            analytics['avg_player_level'] = round(total_player_level / total_with_levels, 1)
+            analytics['avg_opponent_level'] = round(total_opponent_level / total_with_levels, 1)
+            analytics['level_advantage_wins'] = level_advantage_wins
+            analytics['level_disadvantage_wins'] = level_disadvantage_wins
+            analytics['total_with_levels'] = total_with_levels
         
-        .favorite-card-item {
-            background: rgba(255, 255, 255, 0.9);
-            border-radius: 10px;
-            padding: 10px;
-            text-align: center;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-        }
+        # Opponent clan analysis
+        cursor.execute("""
+            SELECT opponent_clan_name, COUNT(*) as battles, 
+                   SUM(CASE WHEN result = 'victory' THEN 1 ELSE 0 END) as wins
+            FROM battles 
+            WHERE opponent_clan_name IS NOT NULL 
+            GROUP BY opponent_clan_name 
+            ORDER BY battles DESC 
+            LIMIT 10
+        """)
         
-        .favorite-card-image {
-            width: 50px;
-            height: 60px;
-            object-fit: contain;
-            margin-bottom: 8px;
-        }
+        clan_battles = cursor.fetchall()
+        analytics['opponent_clans'] = [
+            {'name': row[0], 'battles': row[1], 'wins': row[2], 'win_rate': round((row[2] / row[1]) * 100, 1)}
+            for row in clan_battles
+        ]
+        
+        return analytics
+
+    def get_recent_battles(self, limit: int = 15) -> List[Dict]:
+        """Get recent battle data"""
+        if not self.has_database():
+            return []
+            
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = sqlite3.Row
+        
+        cursor.execute("""
+            SELECT battle_time, result,
+                   COALESCE(NULLIF(opponent_name, ''), 'Unknown') AS opponent_name,
+                   COALESCE(opponent_tag, '') AS opponent_tag,
+                   COALESCE(crowns, 0) AS crowns,
+                   COALESCE(trophy_change, 0) AS trophy_change,
+                   COALESCE(deck_cards, '') AS deck_cards,
+                   COALESCE(NULLIF(arena_name, ''), 'Unknown') AS arena_name
+            FROM battles 
+            ORDER BY battle_time DESC 
+            LIMIT ?
+        """, (limit,))
+        
+        battles = []
+        for row in cursor:
+            battles.append({
+                'battle_time': row['battle_time'],
+                'result': row['result'],
+                'opponent_name': row['opponent_name'],
+                'opponent_tag': row['opponent_tag'],
+                'crowns': row['crowns'],
+                'trophy_change': row['trophy_change'],
+                'deck_cards': row['deck_cards'],
+                'arena_name': row['arena_name']
+            })
+        
+        return battles
+    
+    def get_clan_members(self) -> List[Dict]:
+        """Get clan member data"""
+        if not self.has_database():
+            return []
+            
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = sqlite3.Row
+        
+        cursor.execute("""
+            SELECT name, role, COALESCE(trophies, 0) AS trophies,
+                   COALESCE(donations, 0) AS donations,
+                   COALESCE(donations_received, 0) AS donations_received, last_seen
+            FROM clan_members 
+            ORDER BY 
+                CASE role 
+                    WHEN 'leader' THEN 1 
+                    WHEN 'coLeader' THEN 2 
+                    WHEN 'elder' THEN 3 
+                    ELSE 4 
+                END,
+                trophies DESC
+        """)
+        
+        members = []
+        for row in cursor:
+            members.append({
+                'name': row['name'],
+                'role': row['role'],
+                'role_class': _ROLE_CLASS.get(row['role'], 'member'),
+                'role_display': _ROLE_DISPLAY.get(row['role'], row['role']),
+                'trophies': row['trophies'],
+                'trophies_display': _intcomma(row['trophies']),
+                'donations': row['donations'],
+                'donations_received': row['donations_received'],
+                'last_seen': row['last_seen']
+            })
+        
+        return members
+    
+    def get_daily_battle_stats(self, days_limit: int = 30) -> List[Dict]:
+        """Get daily wins/losses aggregation for histogram, including days with no battles"""
+        if not self.has_database():
+            return []
+            
+        cursor = self._get_conn().cursor()
         
-        .favorite-card-info .card-name {
-            display: block;
-            font-weight: 500;
-            color: #2d3748;
-            font-size: 0.9em;
-        }
+        # First, create a complete date range for the last N days
+        cursor.execute("""
+            WITH RECURSIVE date_range(date) AS (
+                SELECT DATE('now', '-' || ? || ' days')
+                UNION ALL
+                SELECT DATE(date, '+1 day')
+                FROM date_range
+                WHERE date < DATE('now')
+            )
+            SELECT 
+                dr.date as battle_date,
+                COALESCE(SUM(CASE WHEN b.result = 'victory' THEN 1 ELSE 0 END), 0) as wins,
+                COALESCE(SUM(CASE WHEN b.result = 'defeat' THEN 1 ELSE 0 END), 0) as losses,
+                COALESCE(SUM(CASE WHEN b.result = 'draw' THEN 1 ELSE 0 END), 0) as draws,
+                COALESCE(COUNT(b.id), 0) as total_battles,
+                -- busiest day from this one onwards, so any trailing slice's first row holds its own max
+                MAX(COUNT(b.id)) OVER (ORDER BY dr.date ROWS BETWEEN CURRENT ROW AND UNBOUNDED FOLLOWING) as max_battles
+            FROM date_range dr
+            LEFT JOIN battles b ON 
+                -- battle_time is 'YYYYMMDDTHHMMSS.000Z', so a day is the range [YYYYMMDD, next YYYYMMDD)
+                b.battle_time >= REPLACE(dr.date, '-', '')
+                AND b.battle_time < REPLACE(DATE(dr.date, '+1 day'), '-', '')
+            GROUP BY dr.date
+            ORDER BY dr.date ASC
+        """, (days_limit - 1,))  # -1 because we include today
         
-        .favorite-card-info .usage-count {
-            color: #4299e1;
-            font-size: 0.8em;
-        }
+        daily_stats = []
+        for row in cursor:
+            daily_stats.append({
+                'date': row[0],
+                'wins': row[1],
+                'losses': row[2],
+                'draws': row[3],
+                'total_battles': row[4],
+                'max_battles': row[5]
+            })
         
-        .experimenters-list {
-            display: flex;
-            flex-direction: column;
-            gap: 8px;
-        }
+        return daily_stats
+    
+    def get_clan_rankings_data(self, days_limit: int = 7) -> List[Dict]:
+        """Get latest clan rankings with progression data"""
+        if not self.has_database():
+            return []
+            
+        cursor = self._get_conn().cursor()
         
-        .experimenter-item {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            background: rgba(255, 255, 255, 0.9);
-            border-radius: 8px;
-            padding: 10px 15px;
-            box-shadow: 0 1px 4px rgba(0, 0, 0, 0.1);
-        }
+        # Check if table exists
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clan_rankings_history'")
+        if not cursor.fetchone():
+            return []
         
-        .experimenter-item .member-name {
-            font-weight: 500;
-            color: #2d3748;
-        }
+        # Get latest rankings
+        cursor.execute("""
+            SELECT 
+                crh.player_tag,
+                crh.name,
+                crh.clan_rank,
+                COALESCE(crh.trophies, 0),
+                COALESCE(crh.donations, 0),
+                COALESCE(crh.donations_received, 0),
+                COALESCE(crh.trophy_change, 0),
+                COALESCE(crh.donation_change, 0),
+                crh.recorded_at,
+                COALESCE(NULLIF(cm.role, ''), 'member'),
+                cm.last_seen
+            FROM (
+                SELECT player_tag, MAX(recorded_at) AS recorded_at
+                FROM clan_rankings_history
+                GROUP BY player_tag
+            ) latest
+            JOIN clan_rankings_history crh 
+                ON crh.player_tag = latest.player_tag AND crh.recorded_at = latest.recorded_at
+            LEFT JOIN clan_members cm ON crh.player_tag = cm.player_tag
+            ORDER BY crh.clan_rank ASC, crh.id ASC
+        """)
         
-        .experimenter-item .change-count {
-            color: #4299e1;
-            font-size: 0.9em;
-            font-weight: bold;
-        }
+        rankings = []
+        for row in cursor:
+            rankings.append({
+                'player_tag': row[0],
+                'name': row[1],
+                'clan_rank': row[2],
+                'trophies': row[3],
+                'trophies_display': _intcomma(row[3]),
+                'donations': row[4],
+                'donations_received': row[5],
+                'trophy_change': row[6],
+                'donation_change': row[7],
+                'recorded_at': row[8],
+                'role': row[9],
+                'role_class': _ROLE_CLASS.get(row[9], 'member'),
+                'role_display': _ROLE_DISPLAY.get(row[9], row[9]),
+                'last_seen': row[10]
+            })
         
-        /* Card Level Analytics Styles */
-        .level-comparison {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 20px;
-            margin-bottom: 20px;
-        }
+        return rankings
+    
+    def get_player_clan_progression(self, player_tag: str, days_limit: int = 30) -> List[Dict]:
+        """Get specific player's clan ranking progression over time"""
+        if not self.has_database():
+            return []
+            
+        cursor = self._get_conn().cursor()
         
-        .level-stat {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            background: rgba(255, 255, 255, 0.9);
-            border-radius: 8px;
-            padding: 15px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-        }
+        # Bind the cutoff day as a literal so the (player_tag, recorded_at) index
+        # drives a bounded range scan; DATE('now') in SQL is UTC as well
+        cutoff = (datetime.now(timezone.utc).date() - timedelta(days=days_limit)).isoformat()
+        cursor.execute("""
+            SELECT 
+                DATE(recorded_at) as date,
+                clan_rank,
+                COALESCE(trophies, 0),
+                COALESCE(trophy_change, 0),
+                COALESCE(donations, 0),
+                COALESCE(donation_change, 0)
+            FROM clan_rankings_history 
+            WHERE player_tag = ?
+                AND recorded_at >= ?
+            ORDER BY recorded_at DESC
+            LIMIT ?
+        """, (player_tag, cutoff, days_limit))
         
-        .level-label {
-            font-weight: 500;
-            color: #2d3748;
-        }
+        progression = []
+        for row in cursor:
+            progression.append({
+                'date': row[0],
+                'clan_rank': row[1],
+                'trophies': row[2],
+                'trophy_change': row[3],
+                'donations': row[4],
+                'donation_change': row[5]
+            })
         
-        .level-value {
-            font-size: 1.5em;
-            font-weight: bold;
-            color: #4299e1;
-        }
+        return progression
+    
+    def get_clan_deck_analytics(self) -> Dict:
+        """Get clan-wide deck and card analytics"""
+        if not self.has_database():
+            return {}
+            
+        cursor = self._get_conn().cursor()
         
-        .level-win-stats {
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 15px;
-            margin-bottom: 20px;
-        }
+        # Check if table exists
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clan_member_decks'")
+        if not cursor.fetchone():
+            return {}
         
-        .win-stat {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            background: rgba(255, 255, 255, 0.8);
-            border-radius: 8px;
-            padding: 12px;
-            box-shadow: 0 1px 4px rgba(0, 0, 0, 0.1);
-        }
+        analytics = {}
         
-        .win-label {
-            font-size: 0.9em;
-            color: #4a5568;
-        }
+        # Most popular current decks
+        cursor.execute(_LATEST_DECKS_CTE + """
+            SELECT deck_cards, COUNT(*) as usage_count, 
+                   GROUP_CONCAT(name, ', ') as users
+            FROM latest
+            GROUP BY deck_cards
+            ORDER BY usage_count DESC, deck_cards
+            LIMIT 10
+        """)
         
-        .win-count {
-            font-weight: bold;
-            color: #38a169;
-        }
+        popular_decks = []
+        for row in cursor:
+            popular_decks.append({
+                'deck_cards': row[0],
+                'usage_count': row[1],
+                'users': row[2]
+            })
+        analytics['popular_decks'] = popular_decks
         
-        .opponent-clans-list {
-            display: flex;
-            flex-direction: column;
-            gap: 12px;
-        }
+        # Most popular favorite cards
+        cursor.execute(_LATEST_DECKS_CTE + """
+            SELECT favorite_card, COUNT(*) as usage_count,
+                   GROUP_CONCAT(name, ', ') as users
+            FROM latest
+            WHERE favorite_card != ''
+            GROUP BY favorite_card
+            ORDER BY usage_count DESC
+            LIMIT 10
+        """)
         
-        .opponent-clan-item {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            background: rgba(255, 255, 255, 0.9);
-            border-radius: 8px;
-            padding: 15px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
-        }
+        favorite_cards = []
+        for row in cursor:
+            favorite_cards.append({
+                'card_name': row[0],
+                'usage_count': row[1],
+                'users': row[2]
+            })
+        analytics['favorite_cards'] = favorite_cards
         
-        .clan-name {
-            font-weight: 500;
-            color: #2d3748;
-            font-size: 1.1em;
-        }
+        # Deck change frequency by player (counting only actual deck composition changes)
+        cursor.execute("""
+            WITH DeckChanges AS (
+                SELECT 
+                    player_tag,
+                    name,
+                    deck_cards,
+                    MIN(first_seen) as first_seen,
+                    MAX(last_seen) as last_seen,
+                    ROW_NUMBER() OVER (PARTITION BY player_tag ORDER BY MIN(first_seen)) as deck_sequence
+                FROM clan_member_decks
+                GROUP BY player_tag, name, deck_cards
+            )
+            SELECT 
+                player_tag, 
+                name, 
+                COUNT(*) as deck_changes,
+                MIN(first_seen) as first_deck,
+                MAX(last_seen) as latest_deck
+            FROM DeckChanges
+            GROUP BY player_tag, name
+            ORDER BY deck_changes DESC
+        """)
         
-        .clan-stats {
-            display: flex;
-            flex-direction: column;
-            align-items: flex-end;
-            gap: 4px;
-        }
+        deck_experimenters = []
+        for row in cursor:
+            deck_experimenters.append({
+                'player_tag': row[0],
+                'name': row[1],
+                'deck_changes': row[2],
+                'first_deck': row[3],
+                'latest_deck': row[4]
+            })
+        analytics['deck_experimenters'] = deck_experimenters
         
-        .battles-count {
-            font-size: 0.9em;
-            color: #718096;
-        }
+        return analytics
+    
+    def format_time_ago(self, timestamp: str) -> str:
+        """Format timestamp as time ago"""
+        return _format_time_ago(timestamp, self._now)
+    
+    def format_date(self, timestamp: str) -> str:
+        """Format timestamp as readable date"""
+        return _format_date(timestamp)
+    
+    def generate_deck_cards_html(self, deck_cards: str, show_names: bool = True) -> str:
+        """Generate HTML for deck cards with images"""
+        if not deck_cards:
+            return ""
         
-        .win-rate {
-            font-weight: bold;
-            font-size: 0.9em;
-        }
+        key = (deck_cards, show_names)
+        cached = self._deck_html_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Decks share most of their cards, so each card container is rendered once
+        fragments = self._card_html_cache[show_names]
+        parts = []
+        for card in deck_cards.split(' | '):
+            fragment = fragments.get(card)
+            if fragment is None:
+                render_card = _CARD_NAMED if show_names else _CARD_COMPACT
+                fragment = fragments[card] = render_card.format(p=self.get_card_image_path(card), c=_esc(card))
+            parts.append(fragment)
+        cards_html = ''.join(parts)
         
-        .clan-analytics-link {
-            color: #4299e1;
-            text-decoration: none;
-            font-weight: bold;
-            font-size: 1.1em;
-            padding: 12px 24px;
-            border: 2px solid #4299e1;
-            border-radius: 8px;
-            display: inline-block;
-            transition: all 0.3s ease;
-            background: rgba(255, 255, 255, 0.9);
-        }
+        css_class = "deck-cards-compact" if not show_names else "deck-cards"
+        html = self._deck_html_cache[key] = f'<div class="{css_class}">{cards_html}</div>'
+        return html
+    
+    def generate_daily_histogram_html(self, daily_stats: List[Dict], css_class: str = "", include_legend: bool = True) -> str:
+        """Generate HTML for daily wins/losses stacked histogram (daily_stats is a trailing slice of get_daily_battle_stats)"""
+        if not daily_stats:
+            return "<p>No daily battle data available for histogram.</p>"
         
-        .clan-analytics-link:hover {
-            background: #4299e1;
-            color: white;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(66, 153, 225, 0.3);
-        }
+        # Pixels per battle: the busiest day fills the 180px max height
+        max_battles = daily_stats[0]['max_battles']
+        px_per_battle = 180 / max_battles if max_battles else 0
         
-        @media (max-width: 768px) {
-            .deck-cards {
-                grid-template-columns: repeat(2, 1fr);
-            }
-            
-            .deck-cards-compact {
-                gap: 6px;
-            }
-            
-            .deck-cards-compact .card-container {
-                padding: 3px;
-                min-width: 40px;
-            }
-            
-            .deck-cards-compact .card-image {
-                width: 40px;
-                height: 48px;
-            }
-            
-            .player-stats {
-                grid-template-columns: 1fr;
-            }
-            
-            .deck-stats {
-                flex-direction: column;
-            }
-            
-            /* Hide tables on mobile, show cards */
-            .desktop-table {
-                display: none;
-            }
-            
-            .battle-cards {
-                display: block;
-            }
-            
-            .clan-member-cards {
-                display: block;
-            }
-            
-            .container {
-                padding: 10px;
-            }
-            
-            .section {
-                padding: 20px;
-            }
-            
-            .header {
-                padding: 20px;
-            }
-            
-            .chart-container {
-                padding: 15px;
-            }
-            
-            .stacked-histogram {
-                height: 150px;
-                padding: 15px 5px 25px 5px;
-            }
-            
-            .histogram-bar {
-                max-width: 15px;
-                margin: 0 1px;
-            }
+        # Create custom stacked histogram
+        parts = [f'''
+            <div class="chart-container {css_class}">
+                <div class="stacked-histogram">
+        ''']
+        
+        for day in daily_stats:
+            wins = day['wins']
+            losses = day['losses']
+            draws = day['draws']
+            total = day['total_battles']
+            date = day['date']
             
-            .bar-date {
-                font-size: 0.7em;
-                bottom: -20px;
-            }
+            # Calculate heights as percentages of max battles
+            if total == 0:
+                win_height = 0
+                loss_height = 0
+                draw_height = 2  # Minimal height for empty days
+            else:
+                # (count / total) * (total / max) * 180 reduces to count * px_per_battle;
+                # keep a 1px minimum so non-zero segments stay visible
+                win_height = max(wins * px_per_battle, 1) if wins else 0
+                loss_height = max(losses * px_per_battle, 1) if losses else 0
+                draw_height = max(draws * px_per_battle, 1) if draws else 0
             
-            .bar-segment {
-                font-size: 0.65em;
-            }
+            # Create tooltip
+            tooltip = f"{date}: {wins}W/{losses}L/{draws}D" if total > 0 else f"{date}: No battles"
             
-            .histogram-legend {
-                gap: 15px;
-            }
+            parts.append(_HIST_BAR_HEAD % (tooltip, date[-2:]))
             
-            .ranking-stats {
-                flex-direction: column;
-                align-items: flex-start;
-                gap: 8px;
-            }
+            # Add segments from bottom to top: losses, draws, wins
+            if loss_height > 0:
+                parts.append(_HIST_SEGMENT % ('bar-losses', loss_height, _HIST_SEGMENT_VALUE % losses if losses > 0 else ''))
+            if draw_height > 0:
+                parts.append(_HIST_SEGMENT % ('bar-draws', draw_height, _HIST_SEGMENT_VALUE % draws if draws > 0 else ''))
+            if win_height > 0:
+                parts.append(_HIST_SEGMENT % ('bar-wins', win_height, _HIST_SEGMENT_VALUE % wins if wins > 0 else ''))
             
-            .ranking-header {
-                flex-direction: column;
-                align-items: flex-start;
-                gap: 5px;
-            }
+            # Handle empty days
+            if total == 0:
+                parts.append(_HIST_EMPTY_SEGMENT % draw_height)
             
-            .level-comparison, .level-win-stats {
-                grid-template-columns: 1fr;
-            }
-        }
+            parts.append(_HIST_BAR_TAIL)
         
-        @media (min-width: 769px) {
-            .desktop-table {
-                display: block;
-            }
-            
-            .battle-cards {
-                display: none;
-            }
-            
-            .clan-member-cards {
-                display: none;
-            }
-        }
+        parts.append('''
+                </div>
+            </div>
+        ''')
         
-        /* Sortable table styles */
-        .sortable {
-            cursor: pointer;
-            user-select: none;
-            position: relative;
-            transition: background-color 0.2s ease;
-        }
+        # Add legend only if requested
+        legend_html = ""
+        if include_legend:
+            legend_html = '''
+            <div class="histogram-legend">
+                <div class="legend-item">
+                    <span class="legend-color legend-wins"></span>
+                    <span>Wins</span>
+                </div>
+                <div class="legend-item">
+                    <span class="legend-color legend-losses"></span>
+                    <span>Losses</span>
+                </div>
+            </div>
+            '''
         
-        .sortable:hover {
-            background-color: #3182ce !important;
-        }
+        return ''.join(parts) + legend_html
+    
+    def generate_clan_rankings_html(self, clan_rankings: List[Dict], player_name: str) -> str:
+        """Generate HTML for clan rankings with progression indicators"""
+        if not clan_rankings:
+            return "<p>No clan rankings data available.</p>"
         
-        .sort-indicator {
-            font-size: 0.8em;
-            margin-left: 5px;
-            opacity: 0.6;
-        }
+        render_item = _RANKING_ITEM_TMPL.substitute
+        now = self._now  # exact reference time, taken once in __init__
+        items = ''.join([
+            render_item(
+                row_class="current-player-ranking" if member['name'] == player_name else "",
+                clan_rank=member['clan_rank'],
+                name=_esc(member['name']),
+                role_class=member['role_class'],
+                role_display=member['role_display'],
+                trophies=member['trophies_display'],
+                trophy_indicator=_TROPHY_INDICATOR[(tc > 0) + 2 * (tc < 0)](tc),
+                donations=member['donations'],
+                donations_received=member['donations_received'],
+                donation_indicator=_DONATION_INDICATOR[(dc > 0) + 2 * (dc < 0)](dc),
+                last_seen=_format_time_ago(member['last_seen'], now)
+            )
+            for member in clan_rankings
+            for tc, dc in ((member['trophy_change'], member['donation_change']),)
+        ])
+        return f'<div class="clan-rankings">{items}</div>'
+    
+    def _render_favorite_cards(self, favorite_cards: List[Dict], limit: int) -> str:
+        """Render the favorite card grid, shared by the clan page and the main page summary"""
+        get_card_image_path = self.get_card_image_path
+        render = _FAV_CARD_TMPL.substitute
+        tiles = ''.join([render(img=get_card_image_path(card['card_name']),
+                                name=_esc(card['card_name']),
+                                count=card['usage_count'],
+                                s=_PLURAL_S[card['usage_count'] != 1])
+                         for card in favorite_cards[:limit]])
+        return f'<div class="favorite-cards-grid">{tiles}</div>'
+    
+    def generate_clan_deck_analytics_html(self, deck_analytics: Dict) -> str:
+        """Generate HTML for clan deck analytics"""
+        if not deck_analytics:
+            return "<p>No clan deck data available yet. Data will appear after the next hourly collection.</p>"
         
-        .sortable.sort-asc .sort-indicator:after {
-            content: " ↑";
-            color: #38a169;
-            font-weight: bold;
-        }
+        parts = []
         
-        .sortable.sort-desc .sort-indicator:after {
-            content: " ↓";
-            color: #e53e3e;
-            font-weight: bold;
-        }
+        # Popular decks section - REMOVED: Most Popular Clan Decks section
+        # popular_decks = deck_analytics.get('popular_decks', [])
+        # if popular_decks:
+        #     html += '<div class="analytics-section"><h3>🎯 Most Popular Clan Decks</h3>'
+        #     for i, deck in enumerate(popular_decks[:5], 1):
+        #         deck_cards_html = self.generate_deck_cards_html(deck['deck_cards'], show_names=False)
+        #         html += f'''
+        #             <div class="popular-deck-item">
+        #                 <div class="deck-popularity">
+        #                     <span class="deck-rank">#{i}</span>
+        #                     <div class="deck-info">
+        #                         <span class="usage-count">{deck['usage_count']} member{"s" if deck['usage_count'] > 1 else ""}</span>
+        #                         <span class="users-list">{deck['users']}</span>
+        #                     </div>
+        #                 </div>
+        #                 {deck_cards_html}
+        #             </div>
+        #         '''
+        #     html += '</div>'
         
-        /* Responsive histogram styles */
-        .histogram-desktop {
-            display: block;
-        }
+        # Favorite cards section
+        favorite_cards = deck_analytics.get('favorite_cards', [])
+        if favorite_cards:
+            parts.append('<div class="analytics-section"><h3>⭐ Most Popular Favorite Cards</h3>')
+            parts.append(self._render_favorite_cards(favorite_cards, 8))
+            parts.append('</div>')
         
-        .histogram-mobile {
-            display: none;
-        }
+        # Deck experimenters section - REMOVED: Moved to clan member activity table
+        # deck_experimenters = deck_analytics.get('deck_experimenters', [])
+        # if deck_experimenters:
+        #     html += '<div class="analytics-section"><h3>🔄 Deck Experimenters</h3>'
+        #     html += '<div class="experimenters-list">'
+        #     for member in deck_experimenters[:10]:
+        #         changes = member['deck_changes']
+        #         if changes > 1:  # Only show people who have changed decks
+        #             html += f'''
+        #                 <div class="experimenter-item">
+        #                     <span class="member-name">{member['name']}</span>
+        #                     <span class="change-count">{changes} deck change{"s" if changes > 1 else ""}</span>
+        #                 </div>
+        #             '''
+        #     html += '</div></div>'
+        
+        return ''.join(parts) if parts else "<p>No clan deck analytics available yet.</p>"
+    
+    def generate_card_level_analytics_html(self, analytics: Dict) -> str:
+        """Generate HTML for card level and opponent analytics"""
+        if not analytics:
+            return "<p>Enhanced battle analytics not available yet.</p>"
+        
+        if 'message' in analytics:
+            return f"<p style='color: #666; font-style: italic;'>{analytics['message']}</p>"
+        
+        parts = []
+        
+        # Player vs Opponent Level Analysis
+        if 'avg_player_level' in analytics:
+            parts.append('<div class="analytics-section"><h3>⚖️ Level Matchmaking Analysis</h3>')
+            parts.append(_LEVEL_COMPARISON_TMPL.substitute(
+                avg_player_level=analytics['avg_player_level'],
+                avg_opponent_level=analytics['avg_opponent_level'],
+                level_advantage_wins=analytics['level_advantage_wins'],
+                level_disadvantage_wins=analytics['level_disadvantage_wins']
+            ))
+            parts.append('</div>')
+        
+        # Opponent Clan Analysis
+        opponent_clans = analytics.get('opponent_clans', [])
+        if opponent_clans:
+            parts.append('<div class="analytics-section"><h3>🏰 Opponent Clan Battles</h3><div class="opponent-clans-list">')
+            render_clan = _OPPONENT_CLAN_TMPL.substitute
+            parts.append(''.join([render_clan(name=_esc(clan['name']),
+                                              battles=clan['battles'],
+                                              win_rate=clan['win_rate'],
+                                              color=_WIN_RATE_COLOR[clan['win_rate'] >= 50])
+                                  for clan in opponent_clans[:5]]))  # Show top 5
+            parts.append('</div></div>')
+        
+        return ''.join(parts)
+    
+    def generate_clan_favorite_cards_html(self, deck_analytics: Dict) -> str:
+        """Generate HTML for just clan favorite cards (for main page)"""
+        favorite_cards = deck_analytics.get('favorite_cards', [])
+        if not favorite_cards:
+            return "<p>No favorite card data available yet. <a href='clan.html' style='color: #4299e1;'>View full clan analytics →</a></p>"
+        
+        parts = [self._render_favorite_cards(favorite_cards, 6)]  # Show only top 6 on main page
+        
+        # Add link to full clan analytics
+        parts.append('<div style="text-align: center; margin-top: 15px;">')
+        parts.append('<a href="clan.html" style="color: #4299e1; text-decoration: none; font-weight: bold;">View Full Clan Analytics →</a>')
+        parts.append('</div>')
+        
+        return ''.join(parts)
+    
+    def generate_clan_member_activity_html(self, clan_members: List[Dict], deck_analytics: Dict, player_name: str) -> str:
+        """Generate HTML for clan member activity section"""
+        if not clan_members:
+            return "<p>No clan member data available.</p>"
         
-        @media (max-width: 768px) {
-            .histogram-desktop {
-                display: none;
-            }
-            
-            .histogram-mobile {
-                display: block;
-            }
+        # Create deck changes lookup
+        deck_changes_lookup = {}
+        if deck_analytics and 'deck_experimenters' in deck_analytics:
+            for experimenter in deck_analytics['deck_experimenters']:
+                deck_changes_lookup[experimenter['name']] = experimenter['deck_changes']
+        
+        # Generate clan member tables/cards (similar to clan_generator.py)
+        clan_rows = []
+        clan_cards = []
+        
+        # Bound once; these are called for every member row
+        format_time_ago = self.format_time_ago
+        safe_filename = self.safe_filename
+        render_row = _CLAN_ROW_TMPL.substitute
+        render_card = _CLAN_CARD_TMPL.substitute
+        
+        top_members = map(_MEMBER_COLUMNS, clan_members[:20])  # Show top 20 members
+        for name, role_class, role_display, trophies, donations, donations_received, last_seen in top_members:
+            is_current_player = name == player_name
+            row_class = "current-player" if is_current_player else ""
+            card_class = "current-player-card" if is_current_player else ""
             
-            .histogram-mobile .stacked-histogram {
-                height: 180px;
-                padding: 20px 5px 30px 5px;
-            }
+            # Create member filename and link
+            member_filename = f"member_{safe_filename(name)}.html"
+            member_link = f'<a href="{member_filename}" style="color: #4299e1; text-decoration: none; font-weight: bold;">{_esc(name)}</a>'
             
-            .histogram-mobile .histogram-bar {
-                max-width: 20px;
-                margin: 0 2px;
-            }
-        }
-        """
-    
-    def generate_full_html(self, stats, win_rate, deck_performance_html, 
-                          daily_histogram_html, clan_member_activity_html="") -> str:
-        """Generate the complete HTML document"""
+            # Get deck changes for this member
+            deck_changes = deck_changes_lookup.get(name, 0)
+            
+            fields = dict(
+                member_link=member_link,
+                role_class=role_class,
+                role_display=role_display,
+                trophies=trophies,
+                donations=donations,
+                donations_received=donations_received,
+                deck_changes=deck_changes,
+                last_seen=format_time_ago(last_seen)
+            )
+            clan_rows.append(render_row(fields, row_class=row_class))
+            if _INCLUDE_MOBILE:
+                clan_cards.append(render_card(fields, card_class=card_class))
         
-        css_styles = self.get_base_css_styles()
+        clan_table_html = ''.join(clan_rows)
+        clan_cards_html = ''.join(clan_cards)
         
         return f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Clash Royale Analytics - {stats['name']}</title>
-    <link rel="icon" type="image/x-icon" href="/favicon.ico">
-    <link rel="icon" type="image/png" sizes="32x32" href="/favicon-32x32.png">
-    <link rel="icon" type="image/png" sizes="16x16" href="/favicon-16x16.png">
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/charts.css/dist/charts.min.css">
-    <style>{css_styles}</style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>⚔️ Clash Royale Battle Analytics</h1>
-            <div class="player-info">
-                <h2>{stats['name']} ({stats['player_tag']})</h2>
-                <p>Clan: {stats['clan_name'] or 'None'} | Level: {stats['level']}</p>
-                <p style="font-style: italic; color: #666; margin-top: 10px;">
-                    <strong>Player statistics since {self.format_date(stats['first_battle'])}</strong><br>
-                    Statistics are calculated from battles collected since data tracking began and do not reflect lifetime totals.
-                </p>
-            </div>
-            <div class="player-stats">
-                <div class="stat-card">
-                    <h3>Current Trophies</h3>
-                    <div class="value">{stats['trophies']:,}</div>
-                    <small>Best: {stats['best_trophies']:,}</small>
-                </div>
-                <div class="stat-card">
-                    <h3>Win Rate</h3>
-                    <div class="value">{win_rate:.1f}%</div>
-                    <small>{stats['wins']}W / {stats['losses']}L</small>
-                </div>
-                <div class="stat-card">
-                    <h3>Total Battles</h3>
-                    <div class="value">{stats['total_battles']}</div>
-                    <small>{stats['draws']} draws</small>
-                </div>
-                <div class="stat-card">
-                    <h3>Trophy Change</h3>
-                    <div class="value" style="color: {'green' if stats['total_trophy_change'] >= 0 else 'red'}">{stats['total_trophy_change']:+d}</div>
-                    <small>Total from battles</small>
-                </div>
-            </div>
-        </div>
-
         <div class="section">
-            <h2>📊 Daily Battle Activity Log</h2>
+            <h2>🏰 Clan Member Activity</h2>
             <p style="color: #666; margin-bottom: 15px; font-style: italic;">
-                Daily battle history over the last 30 days. Green = wins, red = losses, orange = draws, gray = no battles. Hover for details.
+                Overview of clan member statistics and activity.
             </p>
-            {daily_histogram_html}
-        </div>
-
-        <div class="section">
-            <h2>🏆 Top Performing Decks</h2>
-            {deck_performance_html}
-        </div>
-
-        <!-- COMMENTED OUT - Recent Battles Section
-        <div class="section">
-            <h2>⚔️ Recent Battles</h2>
             <div class="desktop-table">
-                <table>
-                    <thead><tr><th>Time</th><th>Result</th><th>Opponent</th><th>Crowns</th><th>Trophy Δ</th><th>Arena</th></tr></thead>
-                    <tbody>BATTLES_TABLE_HTML</tbody>
+                <table id="clan-members-table">
+                    <thead>
+                        <tr>
+                            <th class="sortable" data-column="name">Name <span class="sort-indicator">↕</span></th>
+                            <th class="sortable" data-column="role">Role <span class="sort-indicator">↕</span></th>
+                            <th class="sortable" data-column="trophies">Trophies <span class="sort-indicator">↕</span></th>
+                            <th class="sortable" data-column="donations">Donations <span class="sort-indicator">↕</span></th>
+                            <th class="sortable" data-column="deck-changes">Deck Changes <span class="sort-indicator">↕</span></th>
+                            <th class="sortable" data-column="last-seen">Last Seen <span class="sort-indicator">↕</span></th>
+                        </tr>
+                    </thead>
+                    <tbody>{clan_table_html}</tbody>
                 </table>
             </div>
-            <div class="battle-cards">BATTLES_CARDS_HTML</div>
-        </div>
-        -->
-
-        <!-- COMMENTED OUT - Clan Favorite Cards Section
-        <div class="section">
-            <h2>⭐ Clan Favorite Cards</h2>
-            <p style="color: #666; margin-bottom: 15px; font-style: italic;">
-                Most popular favorite cards among your clan members.
-            </p>
-            CLAN_FAVORITE_CARDS_HTML
-        </div>
-        -->
-
-
-        <!-- COMMENTED OUT - Advanced Battle Analytics Section
-        <div class="section">
-            <h2>📈 Advanced Battle Analytics</h2>
-            <p style="color: #666; margin-bottom: 15px; font-style: italic;">
-                Enhanced analytics including card levels, opponent analysis, and matchmaking fairness.
-            </p>
-            CARD_LEVEL_ANALYTICS_HTML
-        </div>
-        -->
-
-        {clan_member_activity_html}
-
-        <div class="footer">
-            <p>Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p>Data last updated: {self.format_time_ago(stats['last_updated'])}</p>
-            <p>Automatically updated via GitHub Actions</p>
+            <div class="clan-member-cards">{clan_cards_html}</div>
         </div>
-    </div>
+        """
     
-    <script>
-    // Table sorting functionality
-    document.addEventListener('DOMContentLoaded', function() {{
-        var table = document.getElementById('clan-members-table');
-        if (!table) return; // Exit if table doesn't exist
+    def generate_html_report(self) -> str:
+        """Generate complete HTML report for GitHub Pages"""
+        return ''.join(self.iter_html_report())
+    
+    def write_html_report(self, path: str, inputs: Optional[Dict] = None):
+        """Stream the HTML report to path without materializing the whole document"""
+        # Write next to the target and rename so a live site never serves a partial page
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.writelines(chunk.encode('utf-8') for chunk in self.iter_html_report(inputs))
+        os.replace(tmp_path, path)
+    
+    def write_gzip_copy(self, path: str):
+        """Write path + '.gz' for hosts that serve precompressed files; skipped while it is current"""
+        gz_path = path + '.gz'
+        try:
+            if os.path.getmtime(gz_path) >= os.path.getmtime(path):
+                return
+        except OSError:
+            pass
+        tmp_path = gz_path + '.tmp'
+        with open(path, 'rb') as src, open(tmp_path, 'wb') as raw:
+            # mtime=0 and no embedded filename keep the archive byte-stable between runs
+            with gzip.GzipFile(filename='', mode='wb', compresslevel=9, fileobj=raw, mtime=0) as gz:
+                shutil.copyfileobj(src, gz, _WRITE_BUFFER_SIZE)
+        os.replace(tmp_path, gz_path)
+    
+    def get_report_inputs(self) -> Dict:
+        """Fetch all data the main report is rendered from"""
+        with self.read_snapshot():
+            return {
+                'stats': self.get_player_stats(),
+                'decks': self.get_deck_performance(10),
+                # 'battles': self.get_recent_battles(15),  # Commented out - Recent Battles section
+                'daily_stats': self.get_daily_battle_stats(30),
+                'clan_members': self.get_clan_members(),
+                'deck_analytics': self.get_clan_deck_analytics(),
+                # 'card_level_analytics': self.get_card_level_analytics(),  # Commented out - Advanced Battle Analytics section
+            }
+    
+    def report_digest(self, inputs: Dict) -> str:
+        """Hash what the report renders from: inputs, relative time labels, stylesheet and this module's source"""
+        digest = hashlib.sha256()
+        with open(__file__, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'mobile' if _INCLUDE_MOBILE else b'desktop')
+        # A CSS change renames the linked stylesheet, and write_stylesheet prunes old ones
+        digest.update(f"{self.STYLESHEET} {_PRETTY_CSS}".encode('utf-8'))
+        
+        # Relative labels move with the clock even when the data doesn't
+        format_time_ago = self.format_time_ago
+        labels = [format_time_ago(member['last_seen']) for member in inputs['clan_members']]
+        stats = inputs['stats']
+        if stats:
+            # The analyzer rewrites last_updated every run; only its rendered label reaches the page
+            labels.append(format_time_ago(stats['last_updated']))
+            inputs = dict(inputs, stats=dict(stats, last_updated=None))
+        
+        digest.update(json.dumps([inputs, labels], sort_keys=True, default=_json_default).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def iter_html_report(self, inputs: Optional[Dict] = None) -> Iterator[str]:
+        """Yield the HTML report in chunks, in document order"""
+        if inputs is None:
+            inputs = self.get_report_inputs()
+        stats = inputs['stats']
+        decks = inputs['decks']
+        daily_stats = inputs['daily_stats']
+        clan_members = inputs['clan_members']
+        deck_analytics = inputs['deck_analytics']
         
-        var headers = table.querySelectorAll('th.sortable');
-        var currentSort = {{ column: '', direction: '' }};
+        if not stats:
+            yield self.generate_error_page()
+            return
         
-        headers.forEach(function(header) {{
-            header.addEventListener('click', function() {{
-                var column = this.getAttribute('data-column');
-                var direction = currentSort.column === column && currentSort.direction === 'asc' ? 'desc' : 'asc';
-                
-                // Remove existing sort classes
-                headers.forEach(function(h) {{ h.classList.remove('sort-asc', 'sort-desc'); }});
-                
-                // Add sort class to current header
-                this.classList.add('sort-' + direction);
-                
-                // Sort the table
-                sortTable(column, direction);
-                
-                currentSort = {{ column: column, direction: direction }};
-            }});
-        }});
+        win_rate = (stats['wins'] / max(stats['total_battles'], 1)) * 100
         
-        function sortTable(column, direction) {{
-            var tbody = table.querySelector('tbody');
-            var rows = Array.from(tbody.querySelectorAll('tr'));
-            
-            rows.sort(function(a, b) {{
-                var aVal, bVal;
-                
-                switch(column) {{
-                    case 'name':
-                        aVal = a.cells[0].textContent.trim().toLowerCase();
-                        bVal = b.cells[0].textContent.trim().toLowerCase();
-                        break;
-                    case 'role':
-                        // Custom role order: leader > co-leader > elder > member
-                        var roleOrder = {{'leader': 1, 'co-leader': 2, 'elder': 3, 'member': 4}};
-                        aVal = roleOrder[a.cells[1].textContent.trim().toLowerCase()] || 5;
-                        bVal = roleOrder[b.cells[1].textContent.trim().toLowerCase()] || 5;
-                        break;
-                    case 'trophies':
-                        aVal = parseInt(a.cells[2].textContent.replace(/,/g, '')) || 0;
-                        bVal = parseInt(b.cells[2].textContent.replace(/,/g, '')) || 0;
-                        break;
-                    case 'donations':
-                        // Extract total donations (sent + received)
-                        var aDonations = a.cells[3].textContent.match(/(\\d+)↑\\s*(\\d+)↓/);
-                        var bDonations = b.cells[3].textContent.match(/(\\d+)↑\\s*(\\d+)↓/);
-                        aVal = aDonations ? parseInt(aDonations[1]) + parseInt(aDonations[2]) : 0;
-                        bVal = bDonations ? parseInt(bDonations[1]) + parseInt(bDonations[2]) : 0;
-                        break;
-                    case 'deck-changes':
-                        aVal = parseInt(a.cells[4].textContent) || 0;
-                        bVal = parseInt(b.cells[4].textContent) || 0;
-                        break;
-                    case 'last-seen':
-                        // Parse relative time strings for sorting
-                        aVal = parseTimeAgo(a.cells[5].textContent.trim());
-                        bVal = parseTimeAgo(b.cells[5].textContent.trim());
-                        break;
-                    default:
-                        aVal = a.cells[0].textContent.trim();
-                        bVal = b.cells[0].textContent.trim();
-                }}
-                
-                if (direction === 'asc') {{
-                    return aVal < bVal ? -1 : aVal > bVal ? 1 : 0;
-                }} else {{
-                    return aVal > bVal ? -1 : aVal < bVal ? 1 : 0;
-                }}
-            }});
-            
-            // Re-append sorted rows
-            rows.forEach(function(row) {{ tbody.appendChild(row); }});
-        }}
+        # Generate deck performance HTML
+        deck_items = []
+        render_deck = _DECK_ITEM_TMPL.substitute
+        generate_deck_cards_html = self.generate_deck_cards_html
+        for i, deck in enumerate(decks, 1):
+            deck_cards_html = generate_deck_cards_html(deck['deck_cards'], show_names=False)
+            
+            deck_items.append(render_deck(
+                rank=i,
+                win_rate=deck['win_rate'],
+                total_battles=deck['total_battles'],
+                wins=deck['wins'],
+                losses=deck['losses'],
+                trophy_color=deck['trophy_color'],
+                trophy_change=_signed(deck['total_trophy_change']),
+                avg_crowns=_fixed1(deck['avg_crowns']),
+                deck_cards_html=deck_cards_html
+            ))
+        deck_performance_html = ''.join(deck_items)
         
-        function parseTimeAgo(timeStr) {{
-            // Convert time ago strings to minutes for sorting
-            if (timeStr === 'never') return 999999;
-            if (timeStr.includes('hours ago')) {{
-                return parseInt(timeStr) * 60;
-            }} else if (timeStr.includes('days ago')) {{
-                return parseInt(timeStr) * 24 * 60;
-            }} else if (timeStr.includes('minutes ago')) {{
-                return parseInt(timeStr);
-            }} else if (timeStr.includes('hour ago')) {{
-                return 60;
-            }} else if (timeStr.includes('day ago')) {{
-                return 24 * 60;
-            }} else if (timeStr.includes('minute ago')) {{
-                return 1;
-            }}
-            return 0; // "just now" or unrecognized format
-        }}
-    }});
-    </script>
-</body>
-</html>
-        """
+        # Generate battle HTML - COMMENTED OUT
+        # battles_table_html = ""
+        # battles_cards_html = ""
+        # 
+        # for battle in battles[:10]:
+        #     result_class = battle['result']
+        #     result_text = battle['result'].upper()
+        #     trophy_color = "green" if battle['trophy_change'] >= 0 else "red"
+        #     
+        #     # Table and card HTML generation
+        #     battles_table_html += f"""
+        #         <tr class="battle-{result_class}">
+        #             <td>{self.format_time_ago(battle['battle_time'])}</td>
+        #             <td><span class="result-{result_class}">{result_text}</span></td>
+        #             <td>{battle['opponent_name']}</td>
+        #             <td>{battle['crowns']}</td>
+        #             <td style="color: {trophy_color}">{battle['trophy_change']:+d}</td>
+        #             <td>{battle['arena_name']}</td>
+        #         </tr>
+        #     """
+        #     
+        #     battles_cards_html += f"""
+        #         <div class="battle-card battle-{result_class}">
+        #             <div class="battle-card-header">
+        #                 <span class="result-{result_class} battle-result">{result_text}</span>
+        #                 <span class="battle-time">{self.format_time_ago(battle['battle_time'])}</span>
+        #             </div>
+        #             <div class="battle-card-content">
+        #                 <div class="battle-info">
+        #                     <strong>vs {battle['opponent_name']}</strong>
+        #                     <span>{battle['arena_name']}</span>
+        #                 </div>
+        #                 <div class="battle-stats">
+        #                     <span class="crown-count">👑 {battle['crowns']}</span>
+        #                     <span class="trophy-change" style="color: {trophy_color}">🏆 {battle['trophy_change']:+d}</span>
+        #                 </div>
+        #             </div>
+        #         </div>
+        #     """
+        
+        # Generate daily histogram for both desktop (30 days) and mobile (7 days)
+        daily_stats_7_days = daily_stats[-7:]  # same rows as get_daily_battle_stats(7), no second query
+        daily_histogram_desktop = self.generate_daily_histogram_html(daily_stats, "histogram-desktop", include_legend=True)
+        daily_histogram_mobile = (self.generate_daily_histogram_html(daily_stats_7_days, "histogram-mobile", include_legend=False)
+                                  if _INCLUDE_MOBILE else "")
+        daily_histogram_html = daily_histogram_desktop + daily_histogram_mobile
+        # clan_favorite_cards_html = self.generate_clan_favorite_cards_html(deck_analytics)  # Commented out
+        # card_level_analytics_html = self.generate_card_level_analytics_html(card_level_analytics)  # Commented out
+        clan_member_activity_html = self.generate_clan_member_activity_html(clan_members, deck_analytics, stats['name'])
+        
+        yield from self.iter_full_html(stats, win_rate, deck_performance_html, 
+                                       daily_histogram_html, clan_member_activity_html)
+    
+    def generate_error_page(self) -> str:
+        """Generate error page when no data is available"""
+        return _ERROR_PAGE_HTML
+    
+    def get_base_css_styles(self) -> str:
+        """Get base CSS styles used across all pages"""
+        return self.BASE_CSS
+    
+    def write_stylesheet(self, docs_dir: str = '../docs') -> str:
+        """Write the base stylesheet under its hashed name (once) and prune generations before the previous one"""
+        # Generation order lives in a manifest: checkouts reset mtimes, so file ages can't rank them
+        manifest_path = os.path.join(docs_dir, _STYLESHEET_MANIFEST)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                generations = f.read().split()
+        except OSError:
+            generations = [entry.name for entry in sorted(os.scandir(docs_dir), key=lambda e: e.stat().st_mtime)
+                           if _is_stylesheet(entry.name)]
+        previous = [name for name in generations if name != self.STYLESHEET]
+        kept = previous[max(len(previous) - _KEPT_STYLESHEETS + 1, 0):] + [self.STYLESHEET]
+        
+        for entry in os.scandir(docs_dir):
+            if _is_stylesheet(entry.name) and entry.name not in kept:
+                os.remove(entry.path)
+        path = os.path.join(docs_dir, self.STYLESHEET)
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.BASE_CSS)
+        if kept != generations:
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(kept) + '\n')
+        return path
+    
+    def write_headers_file(self, docs_dir: str = '../docs') -> str:
+        """Write the _headers caching rules next to the pages when they differ"""
+        path = os.path.join(docs_dir, '_headers')
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                if f.read() == _HEADERS_FILE:
+                    return path
+        except OSError:
+            pass
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(_HEADERS_FILE)
+        return path
+    
+    def generate_full_html(self, stats, win_rate, deck_performance_html, 
+                          daily_histogram_html, clan_member_activity_html="") -> str:
+        """Generate the complete HTML document"""
+        return ''.join(self.iter_full_html(stats, win_rate, deck_performance_html,
+                                           daily_histogram_html, clan_member_activity_html))
+    
+    def iter_full_html(self, stats, win_rate, deck_performance_html, 
+                       daily_histogram_html, clan_member_activity_html="") -> Iterator[str]:
+        """Yield the complete HTML document: static template text interleaved with values"""
+        values = dict(
+            stylesheet=self.STYLESHEET,
+            critical_css=self.CRITICAL_CSS,
+            daily_histogram_html=daily_histogram_html,
+            deck_performance_html=deck_performance_html,
+            clan_member_activity_html=clan_member_activity_html,
+            name=_esc(stats['name']),
+            player_tag=_esc(stats['player_tag']),
+            clan_name=_esc(stats['clan_name'] or 'None'),
+            level=stats['level'],
+            first_battle=self.format_date(stats['first_battle']),
+            trophies=_intcomma(stats['trophies']),
+            best_trophies=_intcomma(stats['best_trophies']),
+            win_rate=_fixed1(win_rate),
+            wins=stats['wins'],
+            losses=stats['losses'],
+            total_battles=stats['total_battles'],
+            draws=stats['draws'],
+            trophy_color='green' if stats['total_trophy_change'] >= 0 else 'red',
+            trophy_change=_signed(stats['total_trophy_change']),
+            generated_at=self.generated_at,
+            last_updated=self.format_time_ago(stats['last_updated'])
+        )
+        yield _REPORT_LITERALS[0]
+        for name, literal in zip(_REPORT_NAMES, _REPORT_LITERALS[1:]):
+            yield str(values[name])
+            yield literal
 
 def main():
     """Generate HTML report for GitHub Pages"""
     generator = GitHubPagesHTMLGenerator()
-    html_content = generator.generate_html_report()
     
     # Ensure docs directory exists
     os.makedirs('../docs', exist_ok=True)
+    generator.write_stylesheet()
+    generator.write_headers_file()
+    
+    # Skip rendering when neither the data nor the generator changed since the last run
+    output_path = '../docs/index.html'
+    digest_path = '../docs/.index.html.sha256'
+    inputs = generator.get_report_inputs()
+    digest = generator.report_digest(inputs)
+    try:
+        with open(digest_path, 'r', encoding='utf-8') as f:
+            up_to_date = f.read().strip() == digest and os.path.exists(output_path)
+    except OSError:
+        up_to_date = False
+    if up_to_date:
+        generator.close()
+        generator.write_gzip_copy(output_path)
+        print("GitHub Pages HTML report up to date: ../docs/index.html")
+        return
     
     # Save as index.html for GitHub Pages in docs directory
-    with open('../docs/index.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    generator.write_html_report(output_path, inputs)
+    generator.close()
+    with open(digest_path, 'w', encoding='utf-8') as f:
+        f.write(digest + '\n')
+    generator.write_gzip_copy(output_path)
     
     print("GitHub Pages HTML report generated: ../docs/index.html")
 
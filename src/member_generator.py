@@ -4,172 +4,24 @@ Individual Member HTML Generator for GitHub Pages
 Generates detailed member pages with deck change tracking
 """
 
-import sqlite3
+import hashlib
+import json
 import os
-import re
+import sqlite3
+import sys
 from datetime import datetime
-from typing import List, Dict, Optional
-from html_generator import GitHubPagesHTMLGenerator
+from typing import List, Dict, Optional, Iterator
+from html_generator import GitHubPagesHTMLGenerator, _ROLE_CLASS, _ROLE_DISPLAY, _PLURAL_S, _esc, _compile_css, _parse_ts, _json_default, _DATE_FORMAT
 
-class MemberPageGenerator(GitHubPagesHTMLGenerator):
-    def __init__(self, db_path: str = "clash_royale.db"):
-        super().__init__(db_path)
-    
-    def get_member_deck_history(self, player_tag: str) -> List[Dict]:
-        """Get complete deck change history for a member, consolidating consecutive identical decks"""
-        if not os.path.exists(self.db_path):
-            return []
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clan_member_decks'")
-        if not cursor.fetchone():
-            conn.close()
-            return []
-        
-        cursor.execute("""
-            SELECT 
-                deck_cards,
-                favorite_card,
-                arena_name,
-                league_name,
-                exp_level,
-                trophies,
-                best_trophies,
-                first_seen,
-                last_seen
-            FROM clan_member_decks 
-            WHERE player_tag = ?
-            ORDER BY first_seen ASC
-        """, (player_tag,))
-        
-        raw_history = []
-        for row in cursor.fetchall():
-            raw_history.append({
-                'deck_cards': row[0],
-                'favorite_card': row[1],
-                'arena_name': row[2],
-                'league_name': row[3],
-                'exp_level': row[4],
-                'trophies': row[5],
-                'best_trophies': row[6],
-                'first_seen': row[7],
-                'last_seen': row[8]
-            })
-        
-        conn.close()
-        
-        # Consolidate consecutive identical decks (same deck_cards)
-        consolidated_history = []
-        current_deck = None
-        
-        for record in raw_history:
-            if current_deck is None or current_deck['deck_cards'] != record['deck_cards']:
-                # Start a new deck period
-                if current_deck is not None:
-                    # Finalize the previous deck
-                    duration = self.calculate_deck_duration(current_deck['first_seen'], current_deck['last_seen'])
-                    current_deck['duration'] = duration
-                    consolidated_history.append(current_deck)
-                
-                # Start new deck period
-                current_deck = record.copy()
-            else:
-                # Same deck, extend the period and update latest info
-                current_deck['last_seen'] = record['last_seen']
-                current_deck['favorite_card'] = record['favorite_card']  # Use most recent favorite card
-                current_deck['arena_name'] = record['arena_name']
-                current_deck['league_name'] = record['league_name']
-                current_deck['exp_level'] = record['exp_level']
-                current_deck['trophies'] = record['trophies']
-                current_deck['best_trophies'] = record['best_trophies']
-        
-        # Don't forget the last deck
-        if current_deck is not None:
-            duration = self.calculate_deck_duration(current_deck['first_seen'], current_deck['last_seen'])
-            current_deck['duration'] = duration
-            consolidated_history.append(current_deck)
-        
-        # Return in reverse chronological order (most recent first)
-        return list(reversed(consolidated_history))
-    
-    def calculate_deck_duration(self, first_seen: str, last_seen: str) -> str:
-        """Calculate how long a deck was used"""
-        if not first_seen or not last_seen:
-            return "Unknown"
-        
-        try:
-            start = datetime.fromisoformat(first_seen.replace('Z', '+00:00'))
-            end = datetime.fromisoformat(last_seen.replace('Z', '+00:00'))
-            duration = end - start
-            
-            if duration.days > 0:
-                return f"{duration.days} day{'s' if duration.days > 1 else ''}"
-            elif duration.seconds > 3600:
-                hours = duration.seconds // 3600
-                return f"{hours} hour{'s' if hours > 1 else ''}"
-            elif duration.seconds > 60:
-                minutes = duration.seconds // 60
-                return f"{minutes} minute{'s' if minutes > 1 else ''}"
-            else:
-                return "Less than a minute"
-        except:
-            return "Unknown"
-    
-    def get_member_info(self, player_tag: str) -> Optional[Dict]:
-        """Get member basic info"""
-        if not os.path.exists(self.db_path):
-            return None
-            
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT name, role, trophies, donations, donations_received, last_seen
-            FROM clan_members 
-            WHERE player_tag = ?
-        """, (player_tag,))
-        
-        row = cursor.fetchone()
-        if not row:
-            conn.close()
-            return None
-        
-        member_info = {
-            'player_tag': player_tag,
-            'name': row[0],
-            'role': row[1],
-            'trophies': row[2] or 0,
-            'donations': row[3] or 0,
-            'donations_received': row[4] or 0,
-            'last_seen': row[5]
-        }
-        
-        conn.close()
-        return member_info
-    
-    def safe_filename(self, name: str) -> str:
-        """Convert member name to safe filename"""
-        # Remove special characters and spaces
-        safe_name = re.sub(r'[^\w\s-]', '', name)
-        safe_name = re.sub(r'\s+', '_', safe_name)
-        return safe_name.lower()
-    
-    def generate_member_page(self, player_tag: str) -> str:
-        """Generate individual member page HTML"""
-        member_info = self.get_member_info(player_tag)
-        if not member_info:
-            return self.generate_member_error_page()
-        
-        deck_history = self.get_member_deck_history(player_tag)
-        
-        return self.generate_member_full_html(member_info, deck_history)
-    
-    def generate_member_error_page(self) -> str:
-        """Generate error page when member data is not available"""
-        return """
+def _parse_seen(timestamp: Optional[str]) -> Optional[datetime]:
+    """Parse a first_seen/last_seen value once per deck period; None when missing or malformed"""
+    try:
+        return _parse_ts(timestamp)
+    except (ValueError, TypeError):
+        return None
+
+# Static page served when a member has no stored data
+_MEMBER_ERROR_PAGE_HTML = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -182,6 +34,7 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
             src: url('assets/fonts/Clash_Regular.otf') format('opentype');
             font-weight: normal;
             font-style: normal;
+            font-display: swap;
         }
         
         @font-face {
@@ -189,6 +42,7 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
             src: url('assets/fonts/Supercell-Magic Regular.ttf') format('truetype');
             font-weight: normal;
             font-style: normal;
+            font-display: swap;
         }
         
         body { 
@@ -222,58 +76,94 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
 </body>
 </html>
         """
-    
-    def generate_deck_timeline_html(self, deck_history: List[Dict]) -> str:
-        """Generate HTML timeline of deck changes"""
-        if not deck_history:
-            return "<p>No deck history available yet.</p>"
-        
-        timeline_html = '<div class="deck-timeline">'
-        
-        for i, deck in enumerate(deck_history):
-            is_current = i == 0  # First item is most recent
-            timeline_class = "timeline-current" if is_current else "timeline-past"
-            
-            deck_cards_html = self.generate_deck_cards_html(deck['deck_cards'], show_names=False)
-            
-            timeline_html += f'''
+
+# One entry of the deck timeline, filled per deck period with str.format_map
+_TIMELINE_ITEM = '''
                 <div class="timeline-item {timeline_class}">
                     <div class="timeline-marker">
-                        <div class="timeline-date">{self.format_date(deck['first_seen'])}</div>
-                        <div class="timeline-duration">{deck['duration']}</div>
+                        <div class="timeline-date">{date}</div>
+                        <div class="timeline-duration">{duration}</div>
                     </div>
                     <div class="timeline-content">
                         <div class="deck-header">
-                            <h3>{'Current Deck' if is_current else 'Previous Deck'}</h3>
+                            <h3>{header_label}</h3>
                             <div class="deck-stats">
-                                <span class="stat">⭐ {deck['favorite_card'] or 'None'}</span>
-                                <span class="stat">🏆 {deck['trophies']:,}</span>
-                                <span class="stat">🏟️ {deck['arena_name'] or 'Unknown'}</span>
+                                <span class="stat">⭐ {fav}</span>
+                                <span class="stat">🏆 {trophies:,}</span>
+                                <span class="stat">🏟️ {arena}</span>
                             </div>
                         </div>
-                        {deck_cards_html}
+                        {cards}
                     </div>
                 </div>
             '''
+
+# Member page around the deck timeline, filled per member with str.format_map
+_MEMBER_PAGE_HEAD = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link rel="dns-prefetch" href="https://via.placeholder.com">
+    <title>Member Profile - {name}</title>
+    <link rel="icon" type="image/svg+xml" href="favicon.svg">
+    <link rel="alternate icon" href="/favicon.ico">
+    <link rel="stylesheet" href="{stylesheet}">
+    <style>{css}</style>
+</head>
+<body>
+    <div class="container">
+        <div class="page-header">
+            <a href="clan.html" class="back-link">← Back to Clan Analytics</a>
+        </div>
         
-        timeline_html += '</div>'
-        return timeline_html
-    
-    def generate_member_full_html(self, member_info: Dict, deck_history: List[Dict]) -> str:
-        """Generate the complete member page HTML"""
-        
-        role_class = {
-            'leader': 'leader',
-            'coLeader': 'co-leader', 
-            'elder': 'elder',
-            'member': 'member'
-        }.get(member_info['role'], 'member')
-        
-        role_display = member_info['role'].replace('coLeader', 'Co-Leader')
-        
-        deck_timeline_html = self.generate_deck_timeline_html(deck_history)
-        
-        css_styles = self.get_base_css_styles() + """
+        <div class="member-header">
+            <h1>👤 {name}</h1>
+            <div class="member-role role-{role_class}">{role_display}</div>
+            <div class="member-stats">
+                <div class="member-stat">
+                    <div class="value">{trophies:,}</div>
+                    <div class="label">Current Trophies</div>
+                </div>
+                <div class="member-stat">
+                    <div class="value">{donations}</div>
+                    <div class="label">Donations Given</div>
+                </div>
+                <div class="member-stat">
+                    <div class="value">{donations_received}</div>
+                    <div class="label">Donations Received</div>
+                </div>
+                <div class="member-stat">
+                    <div class="value">{deck_changes}</div>
+                    <div class="label">Deck Changes</div>
+                </div>
+            </div>
+        </div>
+
+        <div class="section">
+            <h2>🃏 Deck Change Timeline</h2>
+            <p style="color: #666; margin-bottom: 15px; font-style: italic;">
+                Complete history of deck changes and favorite card preferences.
+            </p>
+            """
+
+_MEMBER_PAGE_TAIL = """
+        </div>
+
+        <div class="footer">
+            <p>Member profile generated on {generated_at}</p>
+            <p>Last seen: {last_seen}</p>
+            <p><a href="clan.html" class="back-link">← Back to Clan Analytics</a></p>
+        </div>
+    </div>
+</body>
+</html>
+        """
+
+class MemberPageGenerator(GitHubPagesHTMLGenerator):
+    # Member-page CSS, inlined after the link to the shared base stylesheet
+    MEMBER_PAGE_CSS = _compile_css("""
         
         /* Member Page Specific Styles */
         .page-header {
@@ -325,7 +215,7 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
         .role-leader { background: #d69e2e; color: white; }
         .role-co-leader { background: #3182ce; color: white; }
         .role-elder { background: #38a169; color: white; }
-        .role-member { background: #718096; color: white; }
+        .role-member { background: $muted; color: white; }
         
         .member-stats {
             display: grid;
@@ -344,7 +234,7 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
         .member-stat .value {
             font-size: 1.5em;
             font-weight: bold;
-            color: #4299e1;
+            color: $accent;
         }
         
         .member-stat .label {
@@ -371,7 +261,7 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
         .timeline-item {
             position: relative;
             margin-bottom: 30px;
-            background: rgba(255, 255, 255, 0.9);
+            background: $card_bg;
             border-radius: 15px;
             padding: 20px;
             box-shadow: 0 4px 15px rgba(0, 0, 0, 0.1);
@@ -393,18 +283,18 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
             background: white;
             padding: 5px;
             border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
+            box-shadow: $shadow;
         }
         
         .timeline-date {
             font-size: 0.8em;
-            color: #4299e1;
+            color: $accent;
             font-weight: bold;
         }
         
         .timeline-duration {
             font-size: 0.7em;
-            color: #718096;
+            color: $muted;
         }
         
         .deck-header {
@@ -412,7 +302,7 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
         }
         
         .deck-header h3 {
-            color: #2d3748;
+            color: $text;
             margin-bottom: 8px;
         }
         
@@ -434,66 +324,239 @@ class MemberPageGenerator(GitHubPagesHTMLGenerator):
             .deck-stats { flex-direction: column; gap: 8px; }
             .timeline-marker { left: -35px; }
         }
-        """
+        """)
+    
+    def __init__(self, db_path: str = "clash_royale.db"):
+        super().__init__(db_path)
+        # Whether clan_member_decks exists; checked once per generator
+        self._has_deck_table = None
+        # Hash of the generator sources, seeded once into every page digest
+        self._source_digest = None
+    
+    def get_member_deck_history(self, player_tag: str) -> List[Dict]:
+        """Get complete deck change history for a member, consolidating consecutive identical decks"""
+        return self.get_all_deck_histories().get(player_tag, [])
+    
+    def get_all_deck_histories(self) -> Dict[str, List[Dict]]:
+        """Get every member's consolidated deck history (most recent first) with one query, keyed by player_tag"""
+        if not self.has_database():
+            return {}
+            
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = sqlite3.Row
         
-        return f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Member Profile - {member_info['name']}</title>
-    <link rel="icon" type="image/x-icon" href="/favicon.ico">
-    <link rel="icon" type="image/png" sizes="32x32" href="/favicon-32x32.png">
-    <link rel="icon" type="image/png" sizes="16x16" href="/favicon-16x16.png">
-    <style>{css_styles}</style>
-</head>
-<body>
-    <div class="container">
-        <div class="page-header">
-            <a href="clan.html" class="back-link">← Back to Clan Analytics</a>
-        </div>
+        # Check if table exists (schema doesn't change within a run)
+        if self._has_deck_table is None:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clan_member_decks'")
+            self._has_deck_table = cursor.fetchone() is not None
+        if not self._has_deck_table:
+            return {}
         
-        <div class="member-header">
-            <h1>👤 {member_info['name']}</h1>
-            <div class="member-role role-{role_class}">{role_display}</div>
-            <div class="member-stats">
-                <div class="member-stat">
-                    <div class="value">{member_info['trophies']:,}</div>
-                    <div class="label">Current Trophies</div>
-                </div>
-                <div class="member-stat">
-                    <div class="value">{member_info['donations']}</div>
-                    <div class="label">Donations Given</div>
-                </div>
-                <div class="member-stat">
-                    <div class="value">{member_info['donations_received']}</div>
-                    <div class="label">Donations Received</div>
-                </div>
-                <div class="member-stat">
-                    <div class="value">{len(deck_history)}</div>
-                    <div class="label">Deck Changes</div>
-                </div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>🃏 Deck Change Timeline</h2>
-            <p style="color: #666; margin-bottom: 15px; font-style: italic;">
-                Complete history of deck changes and favorite card preferences.
-            </p>
-            {deck_timeline_html}
-        </div>
-
-        <div class="footer">
-            <p>Member profile generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p>Last seen: {self.format_time_ago(member_info['last_seen'])}</p>
-            <p><a href="clan.html" class="back-link">← Back to Clan Analytics</a></p>
-        </div>
-    </div>
-</body>
-</html>
-        """
+        cursor.execute("""
+            SELECT 
+                player_tag,
+                deck_cards,
+                favorite_card,
+                arena_name,
+                league_name,
+                exp_level,
+                trophies,
+                best_trophies,
+                first_seen,
+                last_seen
+            FROM clan_member_decks 
+            ORDER BY player_tag, first_seen ASC
+        """)
+        
+        raw_histories = {}
+        for row in cursor:
+            raw_histories.setdefault(row['player_tag'], []).append(row)
+        
+        return {player_tag: self._consolidate_deck_history(raw_history)
+                for player_tag, raw_history in raw_histories.items()}
+    
+    def _consolidate_deck_history(self, raw_history: List[sqlite3.Row]) -> List[Dict]:
+        """Merge consecutive identical decks of one member's history, returned most recent first"""
+        consolidated_history = []
+        start = end = None
+        
+        for row in raw_history:
+            if end is not None and row['deck_cards'] == end['deck_cards']:
+                # Same deck, extend the period
+                end = row
+                continue
+            if end is not None:
+                consolidated_history.append(self._deck_period(start, end))
+            start = end = row
+        
+        # Don't forget the last deck
+        if end is not None:
+            consolidated_history.append(self._deck_period(start, end))
+        
+        # Return in reverse chronological order (most recent first)
+        consolidated_history.reverse()
+        return consolidated_history
+    
+    def _deck_period(self, start: sqlite3.Row, end: sqlite3.Row) -> Dict:
+        """Build one deck period from its first and last rows, keeping the latest row's details"""
+        # Parsed once here; the duration and the timeline date both work from these
+        first_seen_dt = _parse_seen(start['first_seen'])
+        last_seen_dt = _parse_seen(end['last_seen'])
+        return {
+            'deck_cards': end['deck_cards'],
+            'favorite_card': end['favorite_card'],
+            'arena_name': end['arena_name'],
+            'league_name': end['league_name'],
+            'exp_level': end['exp_level'],
+            'trophies': end['trophies'],
+            'best_trophies': end['best_trophies'],
+            'first_seen': start['first_seen'],
+            'last_seen': end['last_seen'],
+            'first_seen_dt': first_seen_dt,
+            'last_seen_dt': last_seen_dt,
+            'duration': self.deck_duration(first_seen_dt, last_seen_dt)
+        }
+    
+    def calculate_deck_duration(self, first_seen: str, last_seen: str) -> str:
+        """Calculate how long a deck was used"""
+        return self.deck_duration(_parse_seen(first_seen), _parse_seen(last_seen))
+    
+    def deck_duration(self, first_seen: Optional[datetime], last_seen: Optional[datetime]) -> str:
+        """Calculate how long a deck was used from already parsed timestamps"""
+        if first_seen is None or last_seen is None:
+            return "Unknown"
+        
+        try:
+            duration = last_seen - first_seen
+        except TypeError:  # naive and aware timestamps mixed in one period
+            return "Unknown"
+        
+        if duration.days > 0:
+            return f"{duration.days} day{_PLURAL_S[duration.days != 1]}"
+        elif duration.seconds > 3600:
+            hours = duration.seconds // 3600
+            return f"{hours} hour{_PLURAL_S[hours != 1]}"
+        elif duration.seconds > 60:
+            minutes = duration.seconds // 60
+            return f"{minutes} minute{_PLURAL_S[minutes != 1]}"
+        else:
+            return "Less than a minute"
+    
+    def get_member_info(self, player_tag: str) -> Optional[sqlite3.Row]:
+        """Get member basic info"""
+        return self.get_all_member_info().get(player_tag)
+    
+    def get_all_member_info(self) -> Dict[str, sqlite3.Row]:
+        """Get basic info for every clan member with one query, keyed by player_tag (in player_tag order)"""
+        if not self.has_database():
+            return {}
+            
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = sqlite3.Row
+        
+        cursor.execute("""
+            SELECT player_tag, name, role,
+                   COALESCE(trophies, 0) AS trophies,
+                   COALESCE(donations, 0) AS donations,
+                   COALESCE(donations_received, 0) AS donations_received,
+                   last_seen
+            FROM clan_members 
+            ORDER BY player_tag
+        """)
+        
+        return {row['player_tag']: row for row in cursor}
+    
+    def member_page_digest(self, member_info: Dict, deck_history: List[Dict]) -> str:
+        """Hash what one member's page renders from: its data, the last-seen label, stylesheet and generator sources"""
+        if self._source_digest is None:
+            self._source_digest = hashlib.sha256()
+            for path in (__file__, sys.modules[GitHubPagesHTMLGenerator.__module__].__file__):
+                with open(path, 'rb') as f:
+                    self._source_digest.update(f.read())
+            self._source_digest.update(self.STYLESHEET.encode('utf-8'))
+            self._source_digest.update(self.MEMBER_PAGE_CSS.encode('utf-8'))
+        digest = self._source_digest.copy()
+        # "Last seen" is relative to the clock, so the page changes as time passes even if the data doesn't
+        last_seen_label = self.format_time_ago(member_info['last_seen'])
+        digest.update(json.dumps([member_info, deck_history, last_seen_label],
+                                 sort_keys=True, default=_json_default).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def write_member_page(self, path: str, member_info: Dict, deck_history: List[Dict]):
+        """Stream one member page to path, renamed into place once complete"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.writelines(chunk.encode('utf-8') for chunk in self.iter_member_full_html(member_info, deck_history))
+        os.replace(tmp_path, path)
+    
+    def generate_member_page(self, player_tag: str) -> str:
+        """Generate individual member page HTML"""
+        member_info = self.get_member_info(player_tag)
+        if not member_info:
+            return self.generate_member_error_page()
+        
+        deck_history = self.get_member_deck_history(player_tag)
+        
+        return self.generate_member_full_html(member_info, deck_history)
+    
+    def generate_member_error_page(self) -> str:
+        """Generate error page when member data is not available"""
+        return _MEMBER_ERROR_PAGE_HTML
+    
+    def generate_deck_timeline_html(self, deck_history: List[Dict]) -> str:
+        """Generate HTML timeline of deck changes"""
+        return ''.join(self.iter_deck_timeline_html(deck_history))
+    
+    def iter_deck_timeline_html(self, deck_history: List[Dict]) -> Iterator[str]:
+        """Yield the deck timeline in chunks, one per deck period"""
+        if not deck_history:
+            yield "<p>No deck history available yet.</p>"
+            return
+        
+        yield '<div class="deck-timeline">'
+        render_item = _TIMELINE_ITEM.format_map
+        generate_deck_cards_html = self.generate_deck_cards_html
+        
+        for i, deck in enumerate(deck_history):
+            is_current = i == 0  # First item is most recent
+            yield render_item({
+                'timeline_class': "timeline-current" if is_current else "timeline-past",
+                'date': deck['first_seen_dt'].strftime(_DATE_FORMAT) if deck['first_seen_dt'] else 'unknown',
+                'duration': deck['duration'],
+                'header_label': 'Current Deck' if is_current else 'Previous Deck',
+                'fav': _esc(deck['favorite_card'] or 'None'),
+                'trophies': deck['trophies'],
+                'arena': _esc(deck['arena_name'] or 'Unknown'),
+                'cards': generate_deck_cards_html(deck['deck_cards'], show_names=False),
+            })
+        
+        yield '</div>'
+    
+    def generate_member_full_html(self, member_info: Dict, deck_history: List[Dict]) -> str:
+        """Generate the complete member page HTML"""
+        return ''.join(self.iter_member_full_html(member_info, deck_history))
+    
+    def iter_member_full_html(self, member_info: Dict, deck_history: List[Dict]) -> Iterator[str]:
+        """Yield the member page in chunks, in document order"""
+        role = member_info['role']
+        
+        # Member-controlled text is escaped once here, before it reaches the templates
+        yield _MEMBER_PAGE_HEAD.format_map({
+            'name': _esc(member_info['name']),
+            'stylesheet': self.STYLESHEET,
+            'css': self.MEMBER_PAGE_CSS,
+            'role_class': _ROLE_CLASS.get(role, 'member'),
+            'role_display': _esc(_ROLE_DISPLAY.get(role, role)),
+            'trophies': member_info['trophies'],
+            'donations': member_info['donations'],
+            'donations_received': member_info['donations_received'],
+            'deck_changes': len(deck_history),
+        })
+        yield from self.iter_deck_timeline_html(deck_history)
+        yield _MEMBER_PAGE_TAIL.format_map({
+            'generated_at': self.generated_at,
+            'last_seen': self.format_time_ago(member_info['last_seen']),
+        })
 
 def main():
     """Generate member pages for all clan members"""
@@ -504,12 +567,12 @@ def main():
         print("Database not found")
         return
     
-    conn = sqlite3.connect("clash_royale.db")
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT DISTINCT player_tag, name FROM clan_members")
-    members = cursor.fetchall()
-    conn.close()
+    # Both reads share the generator's connection and one read transaction
+    with generator.read_snapshot():
+        members = generator.get_all_member_info()
+        # Every member's deck history in one pass instead of a query per member
+        deck_histories = generator.get_all_deck_histories() if members else {}
+    generator.close()
     
     if not members:
         print("No clan members found")
@@ -517,20 +580,48 @@ def main():
     
     # Ensure docs directory exists
     os.makedirs('../docs', exist_ok=True)
+    generator.write_stylesheet()
+    
+    # Skip pages whose data and generator are unchanged since the last run, keyed by player_tag
+    digest_path = '../docs/.member_pages.json'
+    try:
+        with open(digest_path, 'r', encoding='utf-8') as f:
+            previous_digests = json.load(f)
+    except (OSError, ValueError):
+        previous_digests = {}
+    digests = {}
+    
+    # Names that reduce to the same filename: the last member in tag order owns the page
+    filenames = {player_tag: f"member_{generator.safe_filename(member_info['name'])}.html"
+                 for player_tag, member_info in members.items()}
+    owners = {filename: player_tag for player_tag, filename in filenames.items()}
     
     generated_pages = []
     
-    for player_tag, name in members:
-        html_content = generator.generate_member_page(player_tag)
-        filename = f"member_{generator.safe_filename(name)}.html"
+    for player_tag, member_info in members.items():
+        name = member_info['name']
+        filename = filenames[player_tag]
+        if owners[filename] != player_tag:
+            continue
+        deck_history = deck_histories.get(player_tag, [])
         filepath = f"../docs/{filename}"
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        digest = digests[player_tag] = generator.member_page_digest(member_info, deck_history)
+        if previous_digests.get(player_tag) == digest and os.path.exists(filepath):
+            generated_pages.append((name, filename))
+            print(f"Up to date: ../docs/{filename}")
+            continue
+        
+        generator.write_member_page(filepath, member_info, deck_history)
         
         generated_pages.append((name, filename))
         print(f"Generated: ../docs/{filename}")
     
+    if digests != previous_digests:
+        with open(digest_path, 'w', encoding='utf-8') as f:
+            json.dump(digests, f, sort_keys=True, indent=0)
+            f.write('\n')
+    
     print(f"Generated {len(generated_pages)} member pages")
     return generated_pages
 
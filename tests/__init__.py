@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The generators are run from src/ as plain modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
@@ -0,0 +1,75 @@
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import html_generator
+import member_generator
+
+
+class FrozenClock(datetime):
+    """datetime whose now() returns a settable instant"""
+    current = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+    
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current if tz else cls.current.replace(tzinfo=None)
+
+
+class MemberPageSkipTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        src = os.path.join(self.tmp.name, 'src')
+        os.makedirs(src)
+        os.makedirs(os.path.join(self.tmp.name, 'docs'))
+        with sqlite3.connect(os.path.join(src, 'clash_royale.db')) as conn:
+            conn.execute("""
+                CREATE TABLE clan_members (player_tag TEXT PRIMARY KEY, name TEXT, role TEXT, trophies INTEGER,
+                                           donations INTEGER, donations_received INTEGER, last_seen TEXT)
+            """)
+            conn.execute("""
+                CREATE TABLE clan_member_decks (id INTEGER PRIMARY KEY AUTOINCREMENT, player_tag TEXT, deck_cards TEXT,
+                                                favorite_card TEXT, arena_name TEXT, league_name TEXT, exp_level INTEGER,
+                                                trophies INTEGER, best_trophies INTEGER, first_seen TEXT, last_seen TEXT)
+            """)
+            conn.execute("INSERT INTO clan_members VALUES ('#AAA', 'Alice', 'elder', 5000, 10, 5, '20250301T080000.000Z')")
+            conn.execute("""
+                INSERT INTO clan_member_decks (player_tag, deck_cards, favorite_card, arena_name, trophies, first_seen, last_seen)
+                VALUES ('#AAA', 'Knight | Archers', 'Knight', 'Arena 1', 5000, '2025-02-01T10:00:00', '2025-02-03T10:00:00')
+            """)
+        self.page = os.path.join(self.tmp.name, 'docs', 'member_alice.html')
+        self.cwd = os.getcwd()
+        os.chdir(src)
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+    
+    def generate(self, now):
+        FrozenClock.current = now
+        with mock.patch.object(html_generator, 'datetime', FrozenClock), contextlib.redirect_stdout(io.StringIO()) as out:
+            member_generator.main()
+        with open(self.page, encoding='utf-8') as f:
+            return out.getvalue(), f.read()
+    
+    def test_unchanged_page_is_skipped(self):
+        start = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+        self.generate(start)
+        out, _ = self.generate(start + timedelta(minutes=5))
+        self.assertIn("Up to date: ../docs/member_alice.html", out)
+    
+    def test_advancing_the_clock_rewrites_the_page(self):
+        start = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+        _, before = self.generate(start)
+        self.assertIn("Last seen: 4 hours ago", before)
+        out, after = self.generate(start + timedelta(hours=1))
+        self.assertIn("Generated: ../docs/member_alice.html", out)
+        self.assertIn("Last seen: 5 hours ago", after)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from analyzer import ClashRoyaleAnalyzer
+from html_generator import _LATEST_DECKS_CTE
+
+
+class QueryPlanTest(unittest.TestCase):
+    """The report queries read through the indexes init_database creates"""
+    
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        ClashRoyaleAnalyzer('test-token')  # builds the schema in ./clash_royale.db
+        self.conn = sqlite3.connect('clash_royale.db')
+    
+    def tearDown(self):
+        self.conn.close()
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+    
+    def plan(self, sql, params=()):
+        return ' | '.join(row[3] for row in self.conn.execute('EXPLAIN QUERY PLAN ' + sql, params))
+    
+    def test_recent_battles_read_the_battle_time_index(self):
+        plan = self.plan("""
+            SELECT battle_time, result, opponent_name, crowns, trophy_change, deck_cards
+            FROM battles
+            ORDER BY battle_time DESC
+            LIMIT ?
+        """, (15,))
+        self.assertIn('idx_battles_time', plan)
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+    
+    def test_latest_decks_read_the_player_id_index(self):
+        plan = self.plan(_LATEST_DECKS_CTE + "SELECT player_tag, deck_cards FROM latest")
+        self.assertIn('COVERING INDEX idx_cmd_player_id', plan)
+        self.assertNotIn('USE TEMP B-TREE FOR GROUP BY', plan)
+    
+    def test_member_deck_histories_read_the_tag_seen_index(self):
+        plan = self.plan("""
+            SELECT player_tag, deck_cards, favorite_card, arena_name, league_name,
+                   exp_level, trophies, best_trophies, first_seen, last_seen
+            FROM clan_member_decks
+            ORDER BY player_tag, first_seen ASC
+        """)
+        self.assertIn('idx_cmd_tag_seen', plan)
+        # idx_cmd_player_id alone would still need a "RIGHT PART OF ORDER BY" sort on first_seen
+        self.assertNotIn('USE TEMP B-TREE', plan)
+
+
+if __name__ == '__main__':
+    unittest.main()
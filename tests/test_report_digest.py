@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from html_generator import GitHubPagesHTMLGenerator
+
+
+def report_inputs(last_updated='2025-03-01T09:30:00+00:00', last_seen='20250301T080000.000Z'):
+    return {
+        'stats': {'name': 'Player', 'player_tag': '#TAG', 'last_updated': last_updated},
+        'decks': [],
+        'daily_stats': [],
+        'clan_members': [{'name': 'Member', 'role': 'member', 'last_seen': last_seen}],
+        'deck_analytics': {},
+    }
+
+
+class ReportDigestTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.generator = GitHubPagesHTMLGenerator(os.path.join(self.tmp.name, 'missing.db'))
+        self.generator._now = datetime(2025, 3, 1, 12, 0, 37, 250000, tzinfo=timezone.utc)
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_last_updated_only_counts_through_its_label(self):
+        # Both render as "2 hours ago"
+        before = self.generator.report_digest(report_inputs(last_updated='2025-03-01T09:30:00+00:00'))
+        after = self.generator.report_digest(report_inputs(last_updated='2025-03-01T09:45:00+00:00'))
+        self.assertEqual(before, after)
+    
+    def test_advancing_the_clock_changes_the_digest(self):
+        inputs = report_inputs()
+        before = self.generator.report_digest(inputs)
+        self.generator._now += timedelta(hours=1)
+        self.assertNotEqual(before, self.generator.report_digest(inputs))
+    
+    def test_stylesheet_change_changes_the_digest(self):
+        inputs = report_inputs()
+        before = self.generator.report_digest(inputs)
+        self.generator.STYLESHEET = 'styles.other.css'
+        self.assertNotEqual(before, self.generator.report_digest(inputs))
+
+
+if __name__ == '__main__':
+    unittest.main()
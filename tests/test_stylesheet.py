@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from html_generator import GitHubPagesHTMLGenerator
+
+
+class WriteStylesheetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.docs = self.tmp.name
+        self.generator = GitHubPagesHTMLGenerator(os.path.join(self.docs, 'missing.db'))
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def publish(self, name):
+        self.generator.STYLESHEET = name
+        self.generator.write_stylesheet(self.docs)
+    
+    def stylesheets(self):
+        return sorted(name for name in os.listdir(self.docs) if name.endswith('.css'))
+    
+    def test_keeps_the_previous_generation(self):
+        self.publish('styles.aaaa.css')
+        self.publish('styles.bbbb.css')
+        self.assertEqual(self.stylesheets(), ['styles.aaaa.css', 'styles.bbbb.css'])
+    
+    def test_prunes_generations_before_the_previous_one(self):
+        for name in ('styles.aaaa.css', 'styles.bbbb.css', 'styles.cccc.css'):
+            self.publish(name)
+        self.assertEqual(self.stylesheets(), ['styles.bbbb.css', 'styles.cccc.css'])
+    
+    def test_rerun_of_the_same_generation_keeps_the_previous_one(self):
+        self.publish('styles.aaaa.css')
+        self.publish('styles.bbbb.css')
+        # html, clan and member generators each publish the same stylesheet in one run
+        self.publish('styles.bbbb.css')
+        self.publish('styles.bbbb.css')
+        self.assertEqual(self.stylesheets(), ['styles.aaaa.css', 'styles.bbbb.css'])
+    
+    def test_order_survives_reset_mtimes(self):
+        self.publish('styles.aaaa.css')
+        self.publish('styles.bbbb.css')
+        # A fresh checkout gives every file the same mtime; the manifest still ranks them
+        for name in self.stylesheets():
+            os.utime(os.path.join(self.docs, name), (0, 0))
+        self.publish('styles.cccc.css')
+        self.assertEqual(self.stylesheets(), ['styles.bbbb.css', 'styles.cccc.css'])
+    
+    def test_without_manifest_keeps_the_newest_file_on_disk(self):
+        for name, mtime in (('styles.old1.css', 100), ('styles.old2.css', 200)):
+            path = os.path.join(self.docs, name)
+            open(path, 'w').close()
+            os.utime(path, (mtime, mtime))
+        self.publish('styles.cccc.css')
+        self.assertEqual(self.stylesheets(), ['styles.cccc.css', 'styles.old2.css'])
+
+
+if __name__ == '__main__':
+    unittest.main()